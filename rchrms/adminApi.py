@@ -1,12 +1,25 @@
 import frappe
 from frappe import _
 from frappe.utils import nowdate
-import math
 import re
-import base64
-from frappe.utils.file_manager import save_file
 from frappe.utils import get_first_day, get_last_day
-from frappe.utils import getdate, add_days
+from frappe.utils import getdate
+from rchrms.rchrms.doctype.hr_config.hr_config import get_hr_config
+from rchrms.rchrms.doctype.request_work_from_home.request_work_from_home import get_overlapping_wfh_request
+from rchrms.pagination import get_keyset_page, get_status_summary
+from rchrms.checkinState import get_checked_in_employee_states
+from rchrms.leaveBalance import get_leave_balance, get_leave_balances
+from rchrms.sessionEmployee import get_session_employee, get_employee_for_user
+from rchrms.employeeCheckin import (
+    get_checkin_thumbnail_url,
+    validate_geo_location,
+    decode_base64_image,
+    save_checkin_image,
+    save_checkin_image_stream,
+    get_uploaded_image,
+)
+from rchrms.bulkApproval import bulk_set_state
+from rchrms.attendanceRequestImport import import_attendance_requests as import_attendance_requests_from_stream
 ############### Employee Api's Start ######################
 @frappe.whitelist(allow_guest=False)
 def get_all_employees(email=None, employee=None):
@@ -84,7 +97,7 @@ def update_employee(name, **kwargs):
 ############### Employee Api's end ####################
  ############## Employee checkin start #######
 @frappe.whitelist(allow_guest=False)
-def get_employee_checkins(employee=None, log_type=None, month=None, year=None):
+def get_employee_checkins(employee=None, log_type=None, month=None, year=None, cursor=None, page_size=None):
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -122,7 +135,7 @@ def get_employee_checkins(employee=None, log_type=None, month=None, year=None):
                 frappe.response["data"] = None
                 return
 
-        result = frappe.get_list(
+        result, next_cursor = get_keyset_page(
             "Employee Checkin",
             filters=filters,
             fields=[
@@ -134,14 +147,20 @@ def get_employee_checkins(employee=None, log_type=None, month=None, year=None):
                 "skip_auto_attendance",
                 "checkin_image"
             ],
-            limit_page_length=200,
-            order_by="time desc"
+            order_field="time",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=200
         )
 
+        for row in result:
+            row["checkin_thumbnail"] = get_checkin_thumbnail_url(row.get("checkin_image"))
+
         frappe.response["status"] = True
         frappe.response["message"] = "Check-ins fetched successfully"
         frappe.response["total_in_and_out"] = len(result)
         frappe.response["data"] = result
+        frappe.response["next_cursor"] = next_cursor
 
     except Exception as e:
         raw_message = str(e)
@@ -164,7 +183,8 @@ def create_employee_checkin():
 
         data = frappe.local.form_dict
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee_details = get_session_employee(user)
+        employee = employee_details.name if employee_details else None
 
         if not employee:
             frappe.response["status"] = False
@@ -172,8 +192,13 @@ def create_employee_checkin():
             frappe.response["data"] = None
             return
 
+        # Multipart uploads are streamed to disk; base64 form field kept for older clients
+        uploaded_image = get_uploaded_image()
+
         required_fields = ["log_type", "time", "latitude", "longitude", "checkin_image"]
         for field in required_fields:
+            if field == "checkin_image" and uploaded_image:
+                continue
             if not data.get(field):
                 frappe.response["status"] = False
                 frappe.response["message"] = f"Missing required field: {field}"
@@ -181,24 +206,15 @@ def create_employee_checkin():
                 return
 
         # HR config geo-check
-        hr_config = frappe.get_single("HR Config")
-        if hr_config.geo_location_required:
-            config_lat = float(hr_config.latitude)
-            config_lon = float(hr_config.longitude)
-            allowed_area = float(hr_config.allowed_area)
-            user_lat = float(data.get("latitude"))
-            user_lon = float(data.get("longitude"))
-
-            distance = get_distance_in_meters(config_lat, config_lon, user_lat, user_lon)
-
-            if distance > allowed_area:
-                frappe.response["status"] = False
-                frappe.response["message"] = (
-                    f"You are outside the allowed check-in area. "
-                    f"Distance: {round(distance, 2)}m, Allowed: {allowed_area}m."
-                )
-                frappe.response["data"] = None
-                return
+        hr_config = get_hr_config()
+        geo_error, fence = validate_geo_location(
+            hr_config, data.get("latitude"), data.get("longitude"), employee_details.branch
+        )
+        if geo_error:
+            frappe.response["status"] = False
+            frappe.response["message"] = geo_error
+            frappe.response["data"] = None
+            return
 
         # Create the checkin doc
         doc = frappe.new_doc("Employee Checkin")
@@ -210,23 +226,14 @@ def create_employee_checkin():
         doc.device_id = data.get("device_id")
         doc.skip_auto_attendance = frappe.utils.cint(data.get("skip_auto_attendance") or 0)
         doc.insert(ignore_permissions=True)
-        base64_image = data.get("checkin_image")
-        if base64_image:
-            decoded = base64.b64decode(base64_image)
-            filename = f"checkin_{doc.employee}_{frappe.utils.now_datetime().strftime('%Y%m%d%H%M%S')}.png"
-
-            file_doc = save_file(
-                filename,
-                decoded,
-                "Employee Checkin",
-                doc.name if doc.name else None,  # file linked after insert
-                folder=None,
-                is_private=1
-            )
-            # Assign file_url to the doc
-            if file_doc:
-                doc.checkin_image = file_doc.file_url
-                doc.save(ignore_permissions=True)
+        if uploaded_image:
+            file_url = save_checkin_image_stream(doc.employee, doc.name, uploaded_image)
+        else:
+            file_url = save_checkin_image(doc.employee, doc.name, decode_base64_image(data.get("checkin_image")))
+        # Assign file_url to the doc
+        if file_url:
+            doc.checkin_image = file_url
+            doc.save(ignore_permissions=True)
 
         # Insert only once
         #doc.insert(ignore_permissions=True)
@@ -242,6 +249,7 @@ def create_employee_checkin():
             "device_id": doc.device_id,
             "skip_auto_attendance": doc.skip_auto_attendance,
             "checkin_image": doc.checkin_image,
+            "geofence": fence.fence if fence else None,
         }
 
     except Exception as e:
@@ -254,29 +262,41 @@ def create_employee_checkin():
 
 
 
-def get_distance_in_meters(lat1, lon1, lat2, lon2):
-    """Haversine formula to calculate distance between two lat/lon points in meters."""
-    R = 6371000  # Earth radius in meters
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
+@frappe.whitelist(allow_guest=False)
+def get_checked_in_employees():
+    try:
+        if frappe.request.method != "GET":
+            frappe.local.response["http_status_code"] = 405
+            frappe.local.response["status"] = False
+            frappe.local.response["message"] = "Method Not Allowed. Use GET request."
+            frappe.local.response["data"] = None
+            return
 
-    a = math.sin(delta_phi / 2) ** 2 + \
-        math.cos(phi1) * math.cos(phi2) * \
-        math.sin(delta_lambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        states = get_checked_in_employee_states()
+        result = [
+            {"employee": employee, "checkin": state.name, "time": state.time}
+            for employee, state in sorted(states.items(), key=lambda s: s[1].time, reverse=True)
+        ]
 
-    return R * c
+        frappe.response["status"] = True
+        frappe.response["message"] = "Checked-in employees fetched successfully"
+        frappe.response["total_checked_in"] = len(result)
+        frappe.response["data"] = result
+
+    except Exception as e:
+        raw_message = str(e)
+        clean_message = re.sub(r"<.*?>", "", raw_message)
+        frappe.response["status"] = False
+        frappe.response["message"] = clean_message.strip()
+        frappe.response["data"] = None
 
  ############## Employee checkin End #######
 
 
 #################### Leave Application API's Start ##############
 
-from collections import Counter
 @frappe.whitelist(allow_guest=False)
-def get_leave_applications(employee=None):
+def get_leave_applications(employee=None, cursor=None, page_size=None, summary_only=None):
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -295,7 +315,15 @@ def get_leave_applications(employee=None):
         if employee:
             filters["employee"] = employee
 
-        leave_apps = frappe.get_list(
+        summary = get_status_summary("Leave Application", filters)
+        if frappe.utils.cint(summary_only):
+            frappe.response["status"] = True
+            frappe.response["message"] = "Leave applications fetched successfully"
+            frappe.response["summary"] = summary
+            frappe.response["data"] = []
+            return
+
+        leave_apps, next_cursor = get_keyset_page(
             "Leave Application",
             filters=filters,
             fields=[
@@ -315,20 +343,17 @@ def get_leave_applications(employee=None):
                 "description",
                 "company"
             ],
-            order_by="from_date desc",
-            limit_page_length=1000
+            order_field="from_date",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=1000
         )
 
-        total = len(leave_apps)
-        status_counts = Counter(app["status"] for app in leave_apps)
-
         frappe.response["status"]=True
         frappe.response["message"]="Leave applications fetched successfully"
-        frappe.response["summary"]={
-                                    "total_applications": total,
-                                    "status_counts": dict(status_counts)
-                                    }
+        frappe.response["summary"]=summary
         frappe.response["data"]=leave_apps
+        frappe.response["next_cursor"] = next_cursor
 
     except Exception as e:
         raw_message = str(e)
@@ -476,7 +501,7 @@ def delete_leave_application():
 ############# Request Work From Home API's Start ########
 
 @frappe.whitelist(allow_guest=False)
-def get_work_from_home_request(employee=None):
+def get_work_from_home_request(employee=None, cursor=None, page_size=None, summary_only=None):
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -493,7 +518,15 @@ def get_work_from_home_request(employee=None):
         if employee:
             filters["employee"] = employee
 
-        leave_apps = frappe.get_list(
+        summary = get_status_summary("Request Work From Home", filters)
+        if frappe.utils.cint(summary_only):
+            frappe.response["status"] = True
+            frappe.response["message"] = "Request Work From Home fetched successfully"
+            frappe.response["summary"] = summary
+            frappe.response["data"] = []
+            return
+
+        leave_apps, next_cursor = get_keyset_page(
             "Request Work From Home",
             filters=filters,
             fields=[
@@ -509,20 +542,17 @@ def get_work_from_home_request(employee=None):
                 "reason",
                 "work_details"
             ],
-            order_by="from_date desc",
-            limit_page_length=1000
+            order_field="from_date",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=1000
         )
 
-        total = len(leave_apps)
-        status_counts = Counter(app["status"] for app in leave_apps)
-        
         frappe.response["status"]=True
         frappe.response["message"]="Request Work From Home fetched successfully"
-        frappe.response["summary"]={
-                "total_applications": total,
-                "status_counts": dict(status_counts)
-                }
+        frappe.response["summary"]=summary
         frappe.response["data"]=leave_apps
+        frappe.response["next_cursor"] = next_cursor
 
     except Exception as e:
         raw_message = str(e)
@@ -551,20 +581,9 @@ def create_work_from_home_requests():
                 return  # Exit early if a required field is missing
 
         # Check for duplicate WFH requests with overlapping dates
-        duplicate = frappe.db.sql("""
-            SELECT name FROM `tabRequest Work From Home`
-            WHERE employee = %s
-            AND (
-                (from_date <= %s AND to_date >= %s) OR
-                (from_date <= %s AND to_date >= %s) OR
-                (from_date >= %s AND to_date <= %s)
-            )
-        """, (
-            data.get("employee"),
-            data.get("from_date"), data.get("from_date"),
-            data.get("to_date"), data.get("to_date"),
-            data.get("from_date"), data.get("to_date")
-        ), as_dict=True)
+        duplicate = get_overlapping_wfh_request(
+            data.get("employee"), data.get("from_date"), data.get("to_date")
+        )
 
         if duplicate:
             frappe.response["status"] = False
@@ -694,7 +713,7 @@ def delete_work_from_home_request():
 ########### Attendance Request API's Start ############
 
 @frappe.whitelist(allow_guest=False)
-def get_attendance_requests(employee=None):
+def get_attendance_requests(employee=None, cursor=None, page_size=None):
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -713,7 +732,7 @@ def get_attendance_requests(employee=None):
         if employee:
             filters["employee"] = employee
 
-        requests = frappe.get_list(
+        requests, next_cursor = get_keyset_page(
             "Attendance Request",
             filters=filters,
             fields=[
@@ -735,8 +754,10 @@ def get_attendance_requests(employee=None):
                 "amended_from",
                 "workflow_state"
             ],
-            order_by="from_date desc",
-            limit_page_length=1000
+            order_field="from_date",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=1000
         )
 
         total = len(requests)
@@ -745,6 +766,7 @@ def get_attendance_requests(employee=None):
         frappe.response["message"]="Attendance requests fetched successfully"
         frappe.response["total_requests"]=total
         frappe.response["data"]=requests
+        frappe.response["next_cursor"] = next_cursor
 
     except Exception as e:
         raw_message = str(e)
@@ -766,7 +788,7 @@ def post_attendance_request(employee):
         data = frappe.local.form_dict
         if not employee:
             user = frappe.session.user
-            employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+            employee = get_employee_for_user(user)
             if not employee:
                 frappe.response["status"] = False
                 frappe.response["message"] = "No Employee linked with this user"
@@ -817,6 +839,49 @@ def post_attendance_request(employee):
 
 
 
+@frappe.whitelist(allow_guest=False)
+def import_attendance_requests(file_format=None):
+    """Create draft Attendance Requests from an uploaded CSV or NDJSON file, row by row."""
+    try:
+        if frappe.request.method != "POST":
+            frappe.local.response["http_status_code"] = 405
+            frappe.local.response["status"] = False
+            frappe.local.response["message"] = "Method Not Allowed. Use POST request."
+            frappe.local.response["data"] = None
+            return
+
+        frappe.has_permission("Attendance Request", "create", throw=True)
+        upload = (getattr(frappe.request, "files", None) or {}).get("file")
+        if not upload:
+            frappe.response["status"] = False
+            frappe.response["message"] = "Missing required file: file"
+            frappe.response["data"] = None
+            return
+
+        if not file_format:
+            is_ndjson = (upload.filename or "").lower().endswith((".ndjson", ".jsonl"))
+            file_format = "ndjson" if is_ndjson else "csv"
+        if file_format not in ("csv", "ndjson"):
+            frappe.response["status"] = False
+            frappe.response["message"] = "file_format must be csv or ndjson"
+            frappe.response["data"] = None
+            return
+
+        report = import_attendance_requests_from_stream(upload, file_format)
+
+        frappe.response["status"] = True
+        frappe.response["message"] = f"{report.created} of {report.rows} attendance requests imported"
+        frappe.response["data"] = report
+
+    except Exception as e:
+        frappe.db.rollback()
+        raw_message = str(e)
+        clean_message = re.sub(r"<.*?>", "", raw_message)
+        frappe.response["status"] = False
+        frappe.response["message"] = clean_message.strip()
+        frappe.response["data"] = None
+
+
 @frappe.whitelist(allow_guest=False)
 def update_attendance_request():
     try:
@@ -897,8 +962,6 @@ def delete_attendance_request():
 
 @frappe.whitelist(allow_guest=False)
 def get_leave_dashboard(employee=None):
-    from hrms.hr.doctype.leave_application.leave_application import get_leave_details
-
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -909,7 +972,7 @@ def get_leave_dashboard(employee=None):
 
         if not employee:
             user = frappe.session.user
-            employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+            employee = get_employee_for_user(user)
             if not employee:
                 frappe.response["status"] = False
                 frappe.response["message"] = "No Employee linked with this user"
@@ -918,7 +981,7 @@ def get_leave_dashboard(employee=None):
 
         date = frappe.utils.today()
 
-        result = get_leave_details(employee=employee, date=date)
+        result = get_leave_balance(employee, date)
         leave_allocation = result.get("leave_allocation", {})
         lwps = result.get("lwps", [])
 
@@ -939,7 +1002,57 @@ def get_leave_dashboard(employee=None):
 
 
 @frappe.whitelist(allow_guest=False)
-def get_employee_attendance(employee=None):
+def get_leave_balance_grid(department=None, branch=None, reports_to=None, employee=None, date=None, cursor=None, page_size=None):
+    """Leave balances of a department, branch or manager's team, one page of employees at a time."""
+    try:
+        if frappe.request.method != "GET":
+            frappe.local.response["http_status_code"] = 405
+            frappe.local.response["status"] = False
+            frappe.local.response["message"] = "Method Not Allowed. Use GET request."
+            frappe.local.response["data"] = None
+            return
+
+        filters = {"status": "Active"}
+        if department:
+            filters["department"] = department
+        if branch:
+            filters["branch"] = branch
+        if reports_to:
+            filters["reports_to"] = reports_to
+        if employee:
+            filters["name"] = employee
+
+        employees, next_cursor = get_keyset_page(
+            "Employee",
+            filters=filters,
+            fields=["name", "employee_name", "department", "branch"],
+            order_field="name",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=100
+        )
+
+        balances = get_leave_balances([row.name for row in employees], date)
+        leave_types = sorted({leave_type for rows in balances.values() for leave_type in rows})
+        for row in employees:
+            row["leave_balances"] = balances.get(row.name, {})
+
+        frappe.response["status"] = True
+        frappe.response["message"] = "Leave balances fetched successfully"
+        frappe.response["leave_types"] = leave_types
+        frappe.response["data"] = employees
+        frappe.response["next_cursor"] = next_cursor
+
+    except Exception as e:
+        raw_message = str(e)
+        clean_message = re.sub(r"<.*?>", "", raw_message)
+        frappe.response["status"] = False
+        frappe.response["message"] = clean_message.strip()
+        frappe.response["data"] = None
+
+
+@frappe.whitelist(allow_guest=False)
+def get_employee_attendance(employee=None, cursor=None, page_size=None):
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -957,7 +1070,7 @@ def get_employee_attendance(employee=None):
         filters = {}
         if employee:
             filters["employee"] = employee
-        attendance_records = frappe.get_list(
+        attendance_records, next_cursor = get_keyset_page(
             "Attendance",
             filters=filters,
             fields=[
@@ -970,14 +1083,17 @@ def get_employee_attendance(employee=None):
                 "company",
                 "workflow_state"
             ],
-            order_by="attendance_date desc",
-            limit_page_length=1000
+            order_field="attendance_date",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=1000
         )
         total = len(attendance_records)
         frappe.response["status"] = True
         frappe.response["message"] = "Attendance records fetched successfully"
         frappe.response["total_attendance"] = total
         frappe.response["data"] = attendance_records
+        frappe.response["next_cursor"] = next_cursor
 
     except Exception as e:
         raw_message = str(e)
@@ -986,3 +1102,127 @@ def get_employee_attendance(employee=None):
         frappe.response["message"] = clean_message.strip()
         frappe.response["data"] = None
 
+
+
+@frappe.whitelist(allow_guest=False)
+def get_job_logs(job_name=None, status=None, from_date=None, to_date=None, cursor=None, page_size=None):
+    """Scheduler job runs from Rchrms Job Log, newest first, with per-job totals for the range."""
+    try:
+        if frappe.request.method != "GET":
+            frappe.local.response["http_status_code"] = 405
+            frappe.local.response["status"] = False
+            frappe.local.response["message"] = "Method Not Allowed. Use GET request."
+            frappe.local.response["data"] = None
+            return
+
+        filters = {}
+        if job_name:
+            filters["job_name"] = job_name
+        if status:
+            filters["status"] = status
+        if from_date and to_date:
+            filters["started_at"] = ["between", [getdate(from_date), getdate(to_date)]]
+        elif from_date:
+            filters["started_at"] = [">=", getdate(from_date)]
+
+        logs, next_cursor = get_keyset_page(
+            "Rchrms Job Log",
+            filters=filters,
+            fields=[
+                "name",
+                "job_name",
+                "status",
+                "started_at",
+                "duration",
+                "query_count",
+                "rows_read",
+                "rows_written",
+                "peak_memory",
+                "result"
+            ],
+            order_field="started_at",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=200
+        )
+
+        summary = frappe.get_list(
+            "Rchrms Job Log",
+            filters=filters,
+            fields=[
+                "job_name",
+                "count(name) as runs",
+                "avg(duration) as avg_duration",
+                "max(duration) as max_duration",
+                "avg(query_count) as avg_query_count",
+                "max(started_at) as last_run"
+            ],
+            group_by="job_name",
+            order_by="job_name asc"
+        )
+        failed = dict(frappe.get_list(
+            "Rchrms Job Log",
+            filters={**filters, "status": "Failed"},
+            fields=["job_name", "count(name) as failed"],
+            group_by="job_name",
+            as_list=True
+        ))
+        for row in summary:
+            row["failed"] = failed.get(row.job_name, 0)
+
+        frappe.response["status"] = True
+        frappe.response["message"] = "Job logs fetched successfully"
+        frappe.response["summary"] = summary
+        frappe.response["data"] = logs
+        frappe.response["next_cursor"] = next_cursor
+
+    except Exception as e:
+        raw_message = str(e)
+        clean_message = re.sub(r"<.*?>", "", raw_message)
+        frappe.response["status"] = False
+        frappe.response["message"] = clean_message.strip()
+        frappe.response["data"] = None
+
+
+@frappe.whitelist(allow_guest=False)
+def bulk_workflow_action():
+    """Approve or reject many WFH, leave or attendance requests in one call."""
+    try:
+        if frappe.request.method != "POST":
+            frappe.local.response["http_status_code"] = 405
+            frappe.local.response["status"] = False
+            frappe.local.response["message"] = "Method Not Allowed. Use POST request."
+            frappe.local.response["data"] = None
+            return
+        data = frappe.local.form_dict
+
+        for field in ["doctype", "names", "state"]:
+            if not data.get(field):
+                frappe.response["status"] = False
+                frappe.response["message"] = f"Missing required field: {field}"
+                frappe.response["data"] = None
+                return
+
+        names = data.get("names")
+        if isinstance(names, str):
+            # a JSON list, or one name / comma separated names such as WFH-0001,WFH-0002
+            if names.lstrip().startswith("["):
+                names = frappe.parse_json(names)
+            else:
+                names = [name.strip() for name in names.split(",") if name.strip()]
+
+        results = bulk_set_state(data.get("doctype"), names, data.get("state"))
+        frappe.db.commit()
+
+        updated = sum(1 for row in results if row["status"])
+        frappe.response["status"] = True
+        frappe.response["message"] = f"{updated} of {len(results)} documents updated"
+        frappe.response["data"] = results
+
+    except Exception as e:
+        frappe.db.rollback()
+        raw_message = str(e)
+        clean_message = re.sub(r"<.*?>", "", raw_message)
+        frappe.response["status"] = False
+        frappe.response["message"] = clean_message.strip()
+        frappe.response["data"] = None
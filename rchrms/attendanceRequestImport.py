@@ -0,0 +1,208 @@
+import frappe
+import io
+import re
+import csv
+import json
+from frappe.utils import cint, getdate
+
+IMPORT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+REQUIRED_FIELDS = ["employee", "from_date", "to_date", "reason"]
+
+
+def import_attendance_requests(stream, file_format="csv"):
+    """Create draft Attendance Requests from a CSV or NDJSON stream.
+
+    Rows are parsed one at a time and written in chunks of IMPORT_CHUNK_SIZE
+    with a multi-row INSERT and a commit per chunk, so the file is never held
+    in memory. Employee details are fetched once per employee for the whole
+    import and holiday counts come from the shared holiday bitmaps. Returns
+    the number of rows read and created and a row-level error report.
+    """
+    report = frappe._dict(rows=0, created=0, failed=0, errors=[])
+    employees = {}
+    seen = {}
+
+    chunk = []
+    for row_number, row in _read_rows(stream, file_format):
+        report.rows += 1
+        if isinstance(row, Exception):
+            _add_error(report, row_number, row)
+            continue
+        chunk.append((row_number, row))
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            _import_chunk(chunk, employees, seen, report)
+            chunk = []
+
+    if chunk:
+        _import_chunk(chunk, employees, seen, report)
+    return report
+
+
+def _read_rows(stream, file_format):
+    text = io.TextIOWrapper(getattr(stream, "stream", stream), encoding="utf-8-sig", newline="")
+    if file_format == "ndjson":
+        for row_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError("Each line must be a JSON object")
+                yield row_number, row
+            except ValueError as e:
+                yield row_number, e
+    else:
+        # row 1 is the header
+        for row_number, row in enumerate(csv.DictReader(text), start=2):
+            yield row_number, {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+
+
+def _import_chunk(chunk, employees, seen, report):
+    from rchrms.employee_api import calculate_custom_days
+
+    _load_employees({row.get("employee") for _, row in chunk}, employees)
+    existing = _existing_requests(chunk)
+    links = _load_links(chunk, employees)
+
+    docs = []
+    for row_number, row in chunk:
+        try:
+            doc = _make_request(row, employees, links)
+            key = doc.employee
+            overlaps = existing.get(key, []) + seen.get(key, [])
+            if any(start <= doc.to_date and end >= doc.from_date for start, end in overlaps):
+                frappe.throw(f"Overlaps another attendance request of {doc.employee}")
+
+            calculate_custom_days(doc)
+            doc.set_new_name()
+            doc.set_user_and_timestamp()
+            docs.append(doc)
+            seen.setdefault(key, []).append((doc.from_date, doc.to_date))
+        except Exception as e:
+            frappe.clear_messages()
+            _add_error(report, row_number, e)
+
+    if not docs:
+        return
+
+    fields = list(docs[0].get_valid_dict(convert_dates_to_str=True).keys())
+    values = []
+    for doc in docs:
+        valid = doc.get_valid_dict(convert_dates_to_str=True)
+        values.append(tuple(valid.get(f) for f in fields))
+    frappe.db.bulk_insert("Attendance Request", fields, values)
+    frappe.db.commit()
+    report.created += len(docs)
+
+
+def _load_employees(names, employees):
+    missing = [name for name in names if name and name not in employees]
+    if not missing:
+        return
+    for row in frappe.get_all(
+        "Employee",
+        filters={"name": ["in", missing]},
+        fields=["name", "employee_name", "company", "department", "status"],
+    ):
+        employees[row.name] = row
+    for name in missing:
+        employees.setdefault(name, None)
+
+
+def _load_links(chunk, employees):
+    """Reason options and the existing Companies and Shift Types named by the chunk.
+
+    bulk_insert skips the controller's link and select validation, so each
+    row is checked against these instead.
+    """
+    reasons = set((frappe.get_meta("Attendance Request").get_options("reason") or "").split("\n"))
+    reasons.discard("")
+
+    companies = set()
+    for _, row in chunk:
+        employee = employees.get(row.get("employee"))
+        companies.add(row.get("company") or (employee.company if employee else None))
+    companies.discard(None)
+    shifts = {row.get("shift") for _, row in chunk if row.get("shift")}
+
+    return frappe._dict(
+        reasons=reasons,
+        companies=set(frappe.get_all("Company", filters={"name": ["in", list(companies)]}, pluck="name"))
+        if companies else set(),
+        shifts=set(frappe.get_all("Shift Type", filters={"name": ["in", list(shifts)]}, pluck="name"))
+        if shifts else set(),
+    )
+
+
+def _existing_requests(chunk):
+    """Stored, non-cancelled requests of the chunk's employees within the chunk's date span."""
+    names = set()
+    dates = []
+    for _, row in chunk:
+        try:
+            dates.extend([getdate(row.get("from_date")), getdate(row.get("to_date"))])
+            names.add(row.get("employee"))
+        except Exception:
+            continue
+    names.discard(None)
+    if not names or not dates:
+        return {}
+
+    existing = {}
+    for row in frappe.get_all(
+        "Attendance Request",
+        filters={
+            "employee": ["in", list(names)],
+            "docstatus": ["<", 2],
+            "from_date": ["<=", max(dates)],
+            "to_date": [">=", min(dates)],
+        },
+        fields=["employee", "from_date", "to_date"],
+    ):
+        existing.setdefault(row.employee, []).append((getdate(row.from_date), getdate(row.to_date)))
+    return existing
+
+
+def _make_request(row, employees, links):
+    for field in REQUIRED_FIELDS:
+        if not row.get(field):
+            frappe.throw(f"Missing required field: {field}")
+
+    employee = employees.get(row.get("employee"))
+    if not employee:
+        frappe.throw(f"Employee {row.get('employee')} not found")
+    if employee.status != "Active":
+        frappe.throw(f"Employee {employee.name} is not active")
+
+    doc = frappe.new_doc("Attendance Request")
+    doc.employee = employee.name
+    doc.employee_name = employee.employee_name
+    doc.department = employee.department
+    doc.company = row.get("company") or employee.company
+    doc.from_date = getdate(row.get("from_date"))
+    doc.to_date = getdate(row.get("to_date"))
+    doc.reason = row.get("reason")
+    doc.explanation = row.get("explanation") or ""
+    doc.half_day = cint(row.get("half_day"))
+    doc.half_day_date = getdate(row.get("half_day_date")) if doc.half_day and row.get("half_day_date") else None
+    doc.include_holidays = cint(row.get("include_holidays"))
+    doc.shift = row.get("shift") or None
+
+    if doc.reason not in links.reasons:
+        frappe.throw(f"Reason must be one of {', '.join(sorted(links.reasons))}")
+    if doc.company not in links.companies:
+        frappe.throw(f"Company {doc.company} not found")
+    if doc.shift and doc.shift not in links.shifts:
+        frappe.throw(f"Shift Type {doc.shift} not found")
+    if doc.to_date < doc.from_date:
+        frappe.throw("To Date must be after From Date")
+    if doc.half_day_date and not doc.from_date <= doc.half_day_date <= doc.to_date:
+        frappe.throw("Half Day Date must be between From Date and To Date")
+    return doc
+
+
+def _add_error(report, row_number, error):
+    report.failed += 1
+    if len(report.errors) < MAX_REPORTED_ERRORS:
+        report.errors.append({"row": row_number, "error": re.sub(r"<.*?>", "", str(error)).strip()})
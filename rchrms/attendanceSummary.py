@@ -0,0 +1,195 @@
+import frappe
+from frappe.utils import get_datetime, getdate, add_days, now_datetime
+from rchrms.geofence import get_geofence_index
+
+SUMMARY_FIELDS = [
+    "first_in",
+    "last_out",
+    "worked_minutes",
+    "punch_count",
+    "open_session",
+    "geo_fence",
+    "punches_outside_geofence",
+]
+
+
+def update_attendance_summary(doc, method=None):
+    """doc_events hook for Employee Checkin: refresh the days the punch can belong to."""
+    refresh_attendance_summaries(get_summary_days(doc))
+
+
+def get_summary_days(punch):
+    """(employee, date) pairs whose summary a punch can change.
+
+    An overnight session belongs to the day it started on, so an OUT may
+    close the previous day and an IN may claim the next day's first OUT.
+    """
+    date = getdate(punch.time)
+    days = {(punch.employee, date)}
+    if punch.get("shift_start"):
+        days.add((punch.employee, getdate(punch.shift_start)))
+    days.add((punch.employee, add_days(date, 1 if punch.log_type == "IN" else -1)))
+    return days
+
+
+def refresh_attendance_summaries(days):
+    """Recompute the Daily Attendance Summary rows for (employee, date) pairs.
+
+    Reads the punches around just those days in one query and writes every
+    row with a single upsert. Days left without punches lose their row.
+    """
+    days = {(employee, getdate(date)) for employee, date in days}
+    if not days:
+        return
+
+    employees = list({employee for employee, _ in days})
+    dates = [date for _, date in days]
+    # a day's overnight OUT is punched on the next date; its session may have opened the date before
+    punches = frappe.db.sql("""
+        SELECT employee, log_type, time, shift_start, latitude, longitude
+        FROM `tabEmployee Checkin`
+        WHERE employee IN %(employees)s
+            AND time >= %(from_date)s
+            AND time < %(to_date)s
+        ORDER BY employee, time
+    """, {
+        "employees": tuple(employees),
+        "from_date": add_days(min(dates), -1),
+        "to_date": add_days(max(dates), 2),
+    }, as_dict=True)
+
+    punches_by_day = {}
+    for punch, date in assign_attendance_dates(punches):
+        key = (punch.employee, date)
+        if key in days:
+            punches_by_day.setdefault(key, []).append(punch)
+
+    branches = dict(frappe.get_all(
+        "Employee", filters={"name": ["in", employees]}, fields=["name", "branch"], as_list=True
+    ))
+    index = get_geofence_index()
+
+    summaries = [
+        summarize_day(employee, date, punches_by_day[(employee, date)], branches.get(employee), index)
+        for employee, date in sorted(punches_by_day)
+    ]
+    _upsert_summaries(summaries)
+
+    emptied = days - set(punches_by_day)
+    if emptied:
+        frappe.db.delete("Daily Attendance Summary", {
+            "name": ["in", [_summary_name(employee, date) for employee, date in emptied]]
+        })
+
+
+def assign_attendance_dates(punches):
+    """Yield (punch, attendance_date) for punches ordered by employee and time.
+
+    Punches with a shift belong to the date their shift started. Otherwise an
+    OUT that closes a session opened on the previous date belongs to that
+    date, so a 22:00 to 06:00 session is counted whole on the day it began.
+    """
+    employee = None
+    open_date = None
+    for punch in punches:
+        if punch.employee != employee:
+            employee, open_date = punch.employee, None
+
+        date = getdate(punch.time)
+        if punch.get("shift_start"):
+            date = getdate(punch.shift_start)
+        elif punch.log_type == "OUT" and open_date == add_days(date, -1):
+            date = open_date
+
+        if punch.log_type == "IN":
+            # repeated INs keep the session open from the first one
+            open_date = open_date or date
+        elif punch.log_type == "OUT":
+            open_date = None
+        yield punch, date
+
+
+def summarize_day(employee, date, punches, branch=None, index=None):
+    """Fold one day's punches, in time order, into a summary row."""
+    summary = frappe._dict(
+        employee=employee,
+        attendance_date=date,
+        first_in=None,
+        last_out=None,
+        worked_minutes=0,
+        punch_count=len(punches),
+        open_session=0,
+        geo_fence=None,
+        punches_outside_geofence=0,
+    )
+
+    worked_seconds = 0
+    opened_at = None
+    for punch in punches:
+        time = get_datetime(punch.time)
+        if punch.log_type == "IN":
+            summary.first_in = summary.first_in or time
+            # repeated INs keep the session open from the first one
+            opened_at = opened_at or time
+        elif punch.log_type == "OUT":
+            summary.last_out = time
+            if opened_at:
+                worked_seconds += (time - opened_at).total_seconds()
+                opened_at = None
+
+        # latitude/longitude are NOT NULL DEFAULT 0, so (0, 0) means the device sent no location
+        if index is not None and len(index) and (punch.latitude or punch.longitude):
+            fence = index.match(float(punch.latitude), float(punch.longitude), branch=branch)
+            if not fence:
+                summary.punches_outside_geofence += 1
+            elif punch.log_type == "IN" and not summary.geo_fence:
+                summary.geo_fence = fence.fence
+
+    summary.worked_minutes = int(worked_seconds // 60)
+    summary.open_session = 1 if opened_at else 0
+    return summary
+
+
+def _summary_name(employee, date):
+    # matches the doctype's autoname format:{employee}-{attendance_date}
+    return f"{employee}-{getdate(date)}"
+
+
+def _upsert_summaries(summaries):
+    if not summaries:
+        return
+
+    now = now_datetime()
+    user = frappe.session.user
+    columns = ["name", "creation", "modified", "owner", "modified_by", "docstatus",
+               "employee", "attendance_date", *SUMMARY_FIELDS]
+
+    rows = []
+    values = []
+    for summary in summaries:
+        rows.append("(" + ", ".join(["%s"] * len(columns)) + ")")
+        values.extend([
+            _summary_name(summary.employee, summary.attendance_date), now, now, user, user, 0,
+            summary.employee, summary.attendance_date, *(summary[f] for f in SUMMARY_FIELDS),
+        ])
+
+    updates = ", ".join(f"`{f}` = VALUES(`{f}`)" for f in ["modified", "modified_by", *SUMMARY_FIELDS])
+    frappe.db.sql(f"""
+        INSERT INTO `tabDaily Attendance Summary` ({", ".join(f"`{c}`" for c in columns)})
+        VALUES {", ".join(rows)}
+        ON DUPLICATE KEY UPDATE {updates}
+    """, values)
+
+
+def rebuild_attendance_summaries(from_date, to_date):
+    """Recompute every summary row between two dates, one day at a time."""
+    date = getdate(from_date)
+    while date <= getdate(to_date):
+        employees = frappe.db.sql_list("""
+            SELECT DISTINCT employee
+            FROM `tabEmployee Checkin`
+            WHERE time >= %s AND time < %s
+        """, (date, add_days(date, 1)))
+        refresh_attendance_summaries([(employee, date) for employee in employees])
+        frappe.db.commit()
+        date = add_days(date, 1)
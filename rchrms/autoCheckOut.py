@@ -1,55 +1,280 @@
 import frappe
-from frappe.utils import now_datetime, getdate
-from datetime import datetime, timedelta, time
+from frappe.utils import now_datetime, getdate, get_datetime, cint
+from datetime import datetime, timedelta
+from rchrms.employeeCheckin import (
+    make_checkin_doc,
+    reserve_checkin_names,
+    bulk_insert_checkins,
+    get_checkin_employee_details,
+    SHIFT_FIELDS,
+)
+from rchrms.rchrms.doctype.hr_config.hr_config import get_hr_config
+from rchrms.jobTelemetry import scheduled_job
+
+
+WHEEL_SLOT_MINUTES = 5
+WHEEL_SLOTS = 24 * 60 // WHEEL_SLOT_MINUTES
+WHEEL_CACHE_KEY = "rchrms:auto_checkout_wheel"
+WHEEL_CURSOR = "rchrms_auto_checkout_cursor"
+DEFAULT_GRACE_MINUTES = 30
+DEFAULT_FALLBACK_CHECKOUT_TIME = "12:17:00"  # the time the daily auto checkout used to run
+
+
+@scheduled_job
 def auto_checkout():
-    today = getdate(now_datetime())
-    start_of_day = datetime.combine(today, datetime.min.time())
-
-    checkins = frappe.get_all(
-        "Employee Checkin",
-        filters={
-            "log_type": "IN",
-            "time": [">=", start_of_day]
-        },
-        fields=["name", "employee", "time", "latitude", "longitude", "checkin_image"]
+    """Close the sessions of every shift whose end time plus grace fell since the last run.
+
+    Runs every few minutes. Shift Types are hashed onto a time wheel by
+    end time + grace, so each run only touches the slots that elapsed since
+    the previous one. Sessions without a shift fall in the slot of HR
+    Config's fallback checkout time.
+    """
+    now = now_datetime()
+    hr_config = get_hr_config()
+    wheel = get_checkout_wheel(hr_config)
+    grace = timedelta(minutes=_grace_minutes(hr_config))
+
+    current = _floor_to_slot(now)
+    cursor = frappe.db.get_global(WHEEL_CURSOR)
+    cursor = get_datetime(cursor) if cursor else current - timedelta(minutes=WHEEL_SLOT_MINUTES)
+    # never replay more than one full turn of the wheel after downtime
+    cursor = max(cursor, current - timedelta(days=1))
+
+    result = {"open_sessions": 0, "checked_out": 0}
+    tick = cursor + timedelta(minutes=WHEEL_SLOT_MINUTES)
+    while tick <= current:
+        bucket = wheel.get(str(_slot_of(tick)))
+        if bucket:
+            counts = close_slot(tick, bucket, grace, checkout_time=now)
+            for key in result:
+                result[key] += counts[key]
+        tick += timedelta(minutes=WHEEL_SLOT_MINUTES)
+
+    frappe.db.set_global(WHEEL_CURSOR, str(current))
+    frappe.db.commit()
+    return result
+
+
+def close_slot(tick, bucket, grace, checkout_time=None):
+    """Close the open sessions belonging to one wheel slot."""
+    result = {"open_sessions": 0, "checked_out": 0}
+    if bucket.get("shifts"):
+        counts = close_open_sessions(
+            since=tick - timedelta(days=1),
+            shifts=bucket["shifts"],
+            shift_end_before=tick - grace,
+            checkout_time=checkout_time,
+        )
+        for key in result:
+            result[key] += counts[key]
+
+    if bucket.get("unassigned"):
+        counts = close_open_sessions(
+            since=datetime.combine(getdate(tick), datetime.min.time()),
+            shifts=[],
+            checkout_time=checkout_time,
+        )
+        for key in result:
+            result[key] += counts[key]
+    return result
+
+
+def get_checkout_wheel(hr_config=None):
+    """Return {slot: {"shifts": [...], "unassigned": bool}} for the current Shift Types.
+
+    A slot is the WHEEL_SLOT_MINUTES tick at or after a shift's end time plus
+    grace. Cached in redis; rebuilt when a Shift Type or HR Config changes.
+    """
+    hr_config = hr_config or get_hr_config()
+    wheel = frappe.cache.get_value(WHEEL_CACHE_KEY)
+    if wheel and wheel.get("hr_config") == hr_config.version:
+        return wheel["slots"]
+
+    grace = _grace_minutes(hr_config)
+    slots = {}
+    for shift in frappe.get_all("Shift Type", fields=["name", "end_time"]):
+        if shift.end_time is None:
+            continue
+        due = _minutes_of_day(shift.end_time) + grace
+        slot = slots.setdefault(str(_slot_for_minutes(due)), {"shifts": [], "unassigned": False})
+        slot["shifts"].append(shift.name)
+
+    # sessions without a shift are always closed once a day, as before the wheel
+    fallback = getattr(hr_config, "fallback_auto_checkout_time", None) or DEFAULT_FALLBACK_CHECKOUT_TIME
+    slot = slots.setdefault(
+        str(_slot_for_minutes(_minutes_of_day(fallback))), {"shifts": [], "unassigned": False}
+    )
+    slot["unassigned"] = True
+
+    frappe.cache.set_value(WHEEL_CACHE_KEY, {"hr_config": hr_config.version, "slots": slots})
+    return slots
+
+
+def clear_checkout_wheel(doc=None, method=None, *args):
+    frappe.cache.delete_value(WHEEL_CACHE_KEY)
+
+
+def _grace_minutes(hr_config):
+    value = getattr(hr_config, "auto_checkout_grace_minutes", None)
+    return DEFAULT_GRACE_MINUTES if value is None else cint(value)
+
+
+def _minutes_of_day(value):
+    if isinstance(value, timedelta):
+        return int(value.total_seconds()) // 60
+    if isinstance(value, str):
+        value = get_datetime(f"2000-01-01 {value}").time()
+    return value.hour * 60 + value.minute
+
+
+def _slot_for_minutes(minutes):
+    return -(-minutes // WHEEL_SLOT_MINUTES) % WHEEL_SLOTS
+
+
+def _slot_of(moment):
+    return (moment.hour * 60 + moment.minute) // WHEEL_SLOT_MINUTES
+
+
+def _floor_to_slot(moment):
+    return moment.replace(
+        minute=moment.minute - moment.minute % WHEEL_SLOT_MINUTES, second=0, microsecond=0
     )
 
-    for checkin in checkins:
-        out_exists = frappe.db.exists("Employee Checkin", {
-            "employee": checkin["employee"],
-            "log_type": "OUT",
-            "time": [">", checkin["time"]]
-        })
-
-        if not out_exists:
-            frappe.get_doc({
-                "doctype": "Employee Checkin",
-                "employee": checkin["employee"],
+
+def close_open_sessions(since, employees=None, checkout_time=None, shifts=None, shift_end_before=None):
+    """Punch OUT every session opened after `since` that has no later punch.
+
+    `shifts` limits this to sessions on those Shift Types (an empty list means
+    sessions with no shift); `shift_end_before` skips shifts that have not ended.
+
+    Open sessions are found with a single anti-join and the OUT punches are
+    written with one multi-row INSERT and one commit. The OUT reuses the IN's
+    location, photo and shift so no per-row lookups are needed.
+    Returns the number of rows read and written.
+    """
+    checkout_time = checkout_time or now_datetime()
+    if employees is not None and not employees:
+        return {"open_sessions": 0, "checked_out": 0}
+
+    conditions = []
+    if employees:
+        conditions.append("c.employee IN %(employees)s")
+    if shifts:
+        conditions.append("c.shift IN %(shifts)s")
+    elif shifts is not None:
+        conditions.append("IFNULL(c.shift, '') = ''")
+    if shift_end_before:
+        conditions.append("c.shift_end <= %(shift_end_before)s")
+    extra_conditions = "".join(f"\n            AND {condition}" for condition in conditions)
+
+    open_sessions = frappe.db.sql(f"""
+        SELECT c.name, c.employee, c.time, c.latitude, c.longitude, c.checkin_image,
+            {", ".join(f"c.{field}" for field in SHIFT_FIELDS)}
+        FROM `tabEmployee Checkin` c
+        WHERE c.log_type = 'IN'
+            AND c.time >= %(since)s
+            AND c.time <= %(checkout_time)s{extra_conditions}
+            AND NOT EXISTS (
+                SELECT 1 FROM `tabEmployee Checkin` later
+                WHERE later.employee = c.employee
+                    AND later.time > c.time
+            )
+    """, {
+        "since": since,
+        "checkout_time": checkout_time,
+        "employees": tuple(employees or ()),
+        "shifts": tuple(shifts or ()),
+        "shift_end_before": shift_end_before,
+    }, as_dict=True)
+
+    names = reserve_checkin_names(len(open_sessions))
+    employee_details = get_checkin_employee_details([checkin.employee for checkin in open_sessions])
+    docs = [
+        make_checkin_doc(
+            checkin.employee,
+            {
                 "log_type": "OUT",
-                "time": now_datetime(),
-                "latitude": checkin["latitude"],
-                "longitude": checkin["longitude"],
-                "checkin_image": checkin["checkin_image"],
-                "skip_auto_attendance": 0
-            }).insert(ignore_permissions=True)
-            frappe.db.commit()
+                "time": checkout_time,
+                "latitude": checkin.latitude,
+                "longitude": checkin.longitude,
+                "checkin_image": checkin.checkin_image,
+                "skip_auto_attendance": 0,
+            },
+            name=name,
+            shift_from=checkin,
+            employee_details=employee_details.get(checkin.employee, {}),
+        )
+        for checkin, name in zip(open_sessions, names)
+    ]
+
+    bulk_insert_checkins(docs)
+    frappe.db.commit()
+
+    return {"open_sessions": len(open_sessions), "checked_out": len(docs)}
+
+ATTENDANCE_WATERMARK = "rchrms_attendance_watermark::{0}"
+ATTENDANCE_PARALLEL_SHIFTS = 3  # above this, each shift runs in its own worker
 
+
+@scheduled_job(trace_memory=True)
 def autoAttendance():
-    shift_type_name = "Day Shift"
-    day_before_yesterday = (datetime.today() - timedelta(days=2)).date()
-    today_10pm = datetime.combine(datetime.today(), time(22, 0))
- 
+    """Mark auto attendance for every Shift Type that has it enabled.
+
+    Each shift keeps a watermark of the check-ins it has already processed,
+    so a run only looks at punches logged since the previous one.
+    """
+    shift_types = frappe.get_all("Shift Type", filters={"enable_auto_attendance": 1}, pluck="name")
+
+    if len(shift_types) <= ATTENDANCE_PARALLEL_SHIFTS:
+        for shift_type in shift_types:
+            process_shift_attendance(shift_type)
+        return
+
+    for shift_type in shift_types:
+        frappe.enqueue(
+            "rchrms.autoCheckOut.process_shift_attendance",
+            queue="long",
+            job_id=f"rchrms_auto_attendance::{shift_type}",
+            deduplicate=True,
+            shift_type=shift_type,
+        )
+
+
+@scheduled_job
+def process_shift_attendance(shift_type):
+    """Run process_auto_attendance for one shift over the check-ins logged since its watermark."""
+    cutoff = now_datetime()
+    watermark_key = ATTENDANCE_WATERMARK.format(shift_type)
+    watermark = frappe.db.get_global(watermark_key)
+    watermark = get_datetime(watermark) if watermark else cutoff - timedelta(days=2)
+
+    # Back-dated punches logged since the last run pull the window back to their day
+    earliest = frappe.db.sql("""
+        SELECT MIN(time)
+        FROM `tabEmployee Checkin`
+        WHERE shift = %(shift)s
+            AND creation > %(watermark)s
+            AND skip_auto_attendance = 0
+    """, {"shift": shift_type, "watermark": watermark})[0][0]
+
+    process_attendance_after = getdate(watermark)
+    if earliest:
+        process_attendance_after = min(process_attendance_after, getdate(earliest))
+
     try:
-        shift = frappe.get_doc("Shift Type", shift_type_name)
-        shift.process_attendance_after = day_before_yesterday
-        shift.last_sync_of_checkin = today_10pm
-        shift.save()
+        # set_value instead of save: no controller validation or version row per run
+        frappe.db.set_value("Shift Type", shift_type, {
+            "process_attendance_after": process_attendance_after,
+            "last_sync_of_checkin": cutoff,
+        }, update_modified=False)
         frappe.db.commit()
-        #frappe.log_error("Shift updated successfully. Triggering attendance marking...")
- 
+
+        shift = frappe.get_doc("Shift Type", shift_type)
         shift.process_auto_attendance()
- 
-        #frappe.log_error("Attendance marking triggered successfully.")
- 
+
+        frappe.db.set_global(watermark_key, str(cutoff))
+        frappe.db.commit()
+
     except Exception as e:
-        frappe.log_error("Error in update_shift_sync_dates: " + str(e))
+        frappe.db.rollback()
+        frappe.log_error(f"Error in auto attendance for {shift_type}: " + str(e))
@@ -0,0 +1,107 @@
+import frappe
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from frappe.utils import getdate, now_datetime
+from rchrms.dbStats import track_queries
+from rchrms.syntheticData import EMPLOYEE_PREFIX, SHIFT_TYPE, generate_synthetic_data
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, days=5, company=None, output=None):
+    """Time the scheduler jobs at each employee count and return the report.
+
+    Synthetic employees are topped up before each size. Every job runs with
+    commits suppressed and is rolled back afterwards, so each size measures
+    the same starting data. The report is also written to `output` as JSON
+    when given.
+    """
+    report = {
+        "site": frappe.local.site,
+        "generated_at": str(now_datetime()),
+        "versions": {app: frappe.get_attr(f"{app}.__version__") for app in frappe.get_installed_apps()},
+        "days": days,
+        "results": [],
+    }
+
+    for size in sorted(sizes):
+        generate_synthetic_data(size, days=days, company=company)
+        for job, fn in get_benchmark_jobs().items():
+            result = measure(fn)
+            result.update({"employees": size, "job": job})
+            report["results"].append(result)
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    return report
+
+
+def get_benchmark_jobs():
+    from rchrms.autoCheckOut import close_open_sessions, process_shift_attendance
+    from rchrms.leaveAttendance import update_attendance_on_leave_submit
+
+    # time the job itself, not the Rchrms Job Log write around it
+    process_shift_attendance = process_shift_attendance.__wrapped__
+
+    def auto_checkout():
+        today = datetime.combine(getdate(now_datetime()), datetime.min.time())
+        return close_open_sessions(since=today, shifts=[SHIFT_TYPE])
+
+    def auto_attendance():
+        process_shift_attendance(SHIFT_TYPE)
+
+    def auto_attendance_incremental():
+        # first run moves the watermark; the second one is what a regular night costs
+        process_shift_attendance(SHIFT_TYPE)
+        with track_queries() as stats:
+            started = time.perf_counter()
+            process_shift_attendance(SHIFT_TYPE)
+            return {"second_run_seconds": round(time.perf_counter() - started, 4),
+                    "second_run_queries": stats.queries}
+
+    def leave_submit():
+        applications = frappe.get_all(
+            "Leave Application",
+            filters={"employee": ["like", f"{EMPLOYEE_PREFIX}%"], "docstatus": 0},
+            fields=["name", "employee", "leave_type", "from_date", "to_date", "half_day", "half_day_date"],
+        )
+        for application in applications:
+            update_attendance_on_leave_submit(application, "on_submit")
+        return {"leave_applications": len(applications)}
+
+    return {
+        "auto_checkout": auto_checkout,
+        "autoAttendance": auto_attendance,
+        "autoAttendance_incremental": auto_attendance_incremental,
+        "update_attendance_on_leave_submit": leave_submit,
+    }
+
+
+def measure(fn):
+    with rolled_back(), track_queries() as stats:
+        started = time.perf_counter()
+        output = fn()
+        seconds = time.perf_counter() - started
+
+    return {
+        "seconds": round(seconds, 4),
+        "queries": stats.queries,
+        "rows_read": stats.rows_read,
+        "rows_written": stats.rows_written,
+        "output": output,
+    }
+
+
+@contextmanager
+def rolled_back():
+    """Run a block with frappe.db.commit disabled and roll it back afterwards."""
+    db = frappe.db
+    db.commit = lambda *args, **kwargs: None
+    try:
+        yield
+    finally:
+        del db.commit
+        db.rollback()
@@ -0,0 +1,74 @@
+import frappe
+import re
+from frappe.model.workflow import apply_workflow, get_transitions, get_workflow, get_workflow_name
+
+BULK_APPROVAL_DOCTYPES = ("Request Work From Home", "Leave Application", "Attendance Request")
+MAX_BULK_APPROVALS = 500
+
+
+def bulk_set_state(doctype, names, state):
+    """Move each document to `state` and return one result per name.
+
+    Uses the doctype's active workflow when it has one, otherwise the plain
+    status/submit approval. Every item runs under its own savepoint so a bad
+    row is rolled back alone; the caller commits the batch once.
+    """
+    if doctype not in BULK_APPROVAL_DOCTYPES:
+        frappe.throw(f"Bulk approval is not supported for {doctype}")
+    if len(names) > MAX_BULK_APPROVALS:
+        frappe.throw(f"At most {MAX_BULK_APPROVALS} documents can be processed at once")
+    frappe.has_permission(doctype, "write", throw=True)
+
+    workflow = get_workflow(doctype) if get_workflow_name(doctype) else None
+    has_status = frappe.get_meta(doctype).has_field("status")
+
+    results = []
+    for name in dict.fromkeys(names):
+        savepoint = f"bulk_approval_{frappe.generate_hash(length=8)}"
+        frappe.db.savepoint(savepoint)
+        try:
+            doc = frappe.get_doc(doctype, name)
+            if workflow:
+                _apply_workflow_state(doc, workflow, state)
+            else:
+                _apply_status(doc, state, has_status)
+            results.append({
+                "name": name,
+                "status": True,
+                "message": "Updated",
+                "docstatus": doc.docstatus,
+                "workflow_state": doc.get("workflow_state"),
+            })
+        except Exception as e:
+            frappe.db.rollback(save_point=savepoint)
+            frappe.clear_messages()
+            results.append({
+                "name": name,
+                "status": False,
+                "message": re.sub(r"<.*?>", "", str(e)).strip() or "Not found",
+            })
+    return results
+
+
+def _apply_workflow_state(doc, workflow, state):
+    if doc.get(workflow.workflow_state_field) == state:
+        return
+    # get_transitions only offers the transitions the user's roles allow
+    for transition in get_transitions(doc, workflow):
+        if transition.next_state == state:
+            apply_workflow(doc, transition.action)
+            return
+    frappe.throw(f"No permitted transition from {doc.get(workflow.workflow_state_field)} to {state}")
+
+
+def _apply_status(doc, state, has_status):
+    if state not in ("Approved", "Rejected"):
+        frappe.throw("Without a workflow, the target state must be Approved or Rejected")
+    if doc.docstatus != 0:
+        frappe.throw("Only draft documents can be approved or rejected")
+    if not has_status and state == "Rejected":
+        frappe.throw(f"Rejecting a {doc.doctype} needs a workflow")
+
+    if has_status:
+        doc.status = state
+    doc.submit()
@@ -0,0 +1,167 @@
+import frappe
+import re
+from frappe.utils import get_datetime
+from rchrms.checkinState import record_punch
+from rchrms.jobTelemetry import scheduled_job
+from rchrms.employeeCheckin import (
+    make_checkin_doc,
+    get_checkin_employee_details,
+    reserve_checkin_names,
+    bulk_insert_checkins,
+    spool_checkin_image,
+    discard_spooled_image,
+)
+
+QUEUE_DOCTYPE = "Checkin Queue Entry"
+QUEUE_FIELDS = [
+    "name",
+    "employee",
+    "log_type",
+    "time",
+    "latitude",
+    "longitude",
+    "device_id",
+    "skip_auto_attendance",
+    "spool_path",
+]
+FLUSH_BATCH_SIZE = 500
+
+
+def queue_checkin(employee, data, uploaded_image=None):
+    """Append an already validated punch to the ingestion queue and return its queue entry.
+
+    The entry is a row of the append-only Checkin Queue Entry table, committed
+    with the request, and becomes an Employee Checkin when flush_checkin_queue
+    runs. Until then it is visible to its employee through get_pending_checkins.
+    """
+    queue_id = frappe.generate_hash(length=12)
+    payload = frappe._dict(
+        queue_id=queue_id,
+        employee=employee,
+        log_type=data.get("log_type"),
+        time=get_datetime(data.get("time")),
+        latitude=data.get("latitude"),
+        longitude=data.get("longitude"),
+        device_id=data.get("device_id"),
+        skip_auto_attendance=frappe.utils.cint(data.get("skip_auto_attendance") or 0),
+        spool_path=spool_checkin_image(
+            f"queued_{queue_id}",
+            uploaded_image=uploaded_image,
+            image_base64=None if uploaded_image else data.get("checkin_image"),
+        ),
+        queued_at=frappe.utils.now_datetime(),
+    )
+
+    entry = frappe.get_doc({"doctype": QUEUE_DOCTYPE, **payload})
+    entry.name = queue_id
+    entry.set_user_and_timestamp()
+    entry.db_insert()
+
+    frappe.db.after_commit.add(lambda: record_punch(employee, payload.log_type, payload.time, queue_id))
+    return payload
+
+
+def get_pending_checkins(employee):
+    """Queued punches of one employee that have not been flushed yet, newest first."""
+    pending = frappe.get_all(
+        QUEUE_DOCTYPE,
+        filters={"employee": employee},
+        fields=["name", "employee", "log_type", "time", "device_id", "skip_auto_attendance"],
+        order_by="time desc",
+    )
+    for row in pending:
+        row.checkin_image = None
+        row.queued = 1
+    return pending
+
+
+@scheduled_job(log_idle=False)
+def flush_checkin_queue():
+    """Scheduler job: drain the ingestion queue in multi-row inserts, one commit per batch.
+
+    A batch's Employee Checkins and the removal of its queue entries commit
+    together, so a crash mid-flush neither loses nor duplicates a punch.
+    Entries that cannot become a check-in are kept, flagged with the error,
+    for HR to correct.
+    """
+    flushed = 0
+    while True:
+        entries = frappe.get_all(
+            QUEUE_DOCTYPE,
+            filters={"failed": 0},
+            fields=QUEUE_FIELDS,
+            order_by="creation asc, name asc",
+            limit=FLUSH_BATCH_SIZE,
+        )
+        if not entries:
+            break
+
+        docs, images, failed = _prepare_batch(entries)
+
+        bulk_insert_checkins(docs)
+        done = [entry.name for entry in entries if entry.name not in failed]
+        if done:
+            frappe.db.delete(QUEUE_DOCTYPE, {"name": ["in", done]})
+        for name, error in failed.items():
+            frappe.db.set_value(QUEUE_DOCTYPE, name, {"failed": 1, "error": error}, update_modified=False)
+        frappe.db.commit()
+
+        stored = {entry.name for _, entry in images}
+        for entry in entries:
+            # photos of punches that were already ingested
+            if entry.spool_path and entry.name not in stored and entry.name not in failed:
+                discard_spooled_image(entry.spool_path)
+
+        for doc, entry in images:
+            frappe.enqueue(
+                "rchrms.employeeCheckin.attach_checkin_image",
+                queue="short",
+                employee=doc.employee,
+                checkin_name=doc.name,
+                spool_path=entry.spool_path,
+            )
+
+        flushed += len(docs)
+        if len(entries) < FLUSH_BATCH_SIZE:
+            break
+
+    return flushed
+
+
+def _prepare_batch(entries):
+    employees = list({e.employee for e in entries})
+    times = list({get_datetime(e.time) for e in entries})
+    existing = {
+        (row.employee, get_datetime(row.time))
+        for row in frappe.get_all(
+            "Employee Checkin",
+            filters={"employee": ["in", employees], "time": ["in", times]},
+            fields=["employee", "time"]
+        )
+    }
+
+    fresh = []
+    for entry in entries:
+        key = (entry.employee, get_datetime(entry.time))
+        if key not in existing:
+            existing.add(key)
+            fresh.append(entry)
+
+    docs = []
+    images = []
+    failed = {}
+    employee_details = get_checkin_employee_details([entry.employee for entry in fresh])
+    for entry, name in zip(fresh, reserve_checkin_names(len(fresh))):
+        try:
+            doc = make_checkin_doc(
+                entry.employee, entry, name=name, employee_details=employee_details.get(entry.employee, {})
+            )
+        except Exception as e:
+            frappe.clear_messages()
+            failed[entry.name] = re.sub(r"<.*?>", "", str(e)).strip()
+            continue
+
+        docs.append(doc)
+        if entry.spool_path:
+            images.append((doc, entry))
+    return docs, images, failed
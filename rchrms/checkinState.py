@@ -0,0 +1,119 @@
+import frappe
+from frappe.utils import get_datetime, getdate, now_datetime
+
+STATE_KEY = "rchrms:checkin_state"
+STATE_WARM_KEY = "rchrms:checkin_state_warm"
+
+
+def get_last_punch(employee):
+    """Last known punch of an employee as a frappe._dict, or None if they never punched."""
+    state = frappe.cache.hget(STATE_KEY, employee)
+    if state is None:
+        last = frappe.get_all(
+            "Employee Checkin",
+            filters={"employee": employee},
+            fields=["name", "log_type", "time", "shift_actual_end"],
+            order_by="time desc",
+            limit_page_length=1
+        )
+        state = _state(last[0].log_type, last[0].time, last[0].name, last[0].shift_actual_end) if last else {}
+        frappe.cache.hset(STATE_KEY, employee, state)
+
+    return frappe._dict(state) if state else None
+
+
+def record_punch(employee, log_type, time, name=None, shift_end=None):
+    """Move an employee's state forward; older punches (offline replays) are ignored."""
+    current = frappe.cache.hget(STATE_KEY, employee)
+    if current and get_datetime(current["time"]) > get_datetime(time):
+        return
+    frappe.cache.hset(STATE_KEY, employee, _state(log_type, time, name, shift_end))
+
+
+def record_punches(docs):
+    """Update state for rows written with a bulk insert, once the transaction commits."""
+    punches = [(d.employee, d.log_type, d.time, d.name, d.get("shift_actual_end")) for d in docs]
+
+    def apply():
+        for punch in sorted(punches, key=lambda p: get_datetime(p[2])):
+            record_punch(*punch)
+
+    frappe.db.after_commit.add(apply)
+
+
+def update_checkin_state(doc, method=None):
+    """doc_events hook for Employee Checkin."""
+    if method == "on_trash":
+        frappe.db.after_commit.add(lambda: frappe.cache.hdel(STATE_KEY, doc.employee))
+        return
+    record_punches([doc])
+
+
+def is_duplicate_in(employee, log_type, time):
+    """True when an IN is punched while the same day's session is still open."""
+    if log_type != "IN":
+        return False
+    last = get_last_punch(employee)
+    return bool(
+        last
+        and last.log_type == "IN"
+        and getdate(last.time) == getdate(time)
+        and get_datetime(last.time) <= get_datetime(time)
+    )
+
+
+def get_checked_in_employee_states(now=None):
+    """Employee -> last punch for everyone with a session open right now.
+
+    A session is open when the last punch is an IN made today, or an IN
+    whose shift has not ended yet (night shifts running past midnight).
+    Older dangling INs are not counted.
+    """
+    now = get_datetime(now or now_datetime())
+    warm_checkin_state()
+    states = frappe.cache.hgetall(STATE_KEY) or {}
+    return {
+        (employee.decode() if isinstance(employee, bytes) else employee): frappe._dict(state)
+        for employee, state in states.items()
+        if state and state.get("log_type") == "IN" and _is_open(state, now)
+    }
+
+
+def _is_open(state, now):
+    if getdate(state["time"]) == now.date():
+        return True
+    return bool(state.get("shift_end")) and get_datetime(state["shift_end"]) > now
+
+
+def warm_checkin_state():
+    """Load every employee's latest punch in one query when the state hash is cold."""
+    if frappe.cache.get_value(STATE_WARM_KEY):
+        return
+
+    latest = frappe.db.sql("""
+        SELECT c.employee, c.name, c.log_type, c.time, c.shift_actual_end
+        FROM `tabEmployee Checkin` c
+        INNER JOIN (
+            SELECT employee, MAX(time) AS time
+            FROM `tabEmployee Checkin`
+            GROUP BY employee
+        ) last ON last.employee = c.employee AND last.time = c.time
+    """, as_dict=True)
+
+    for row in latest:
+        record_punch(row.employee, row.log_type, row.time, row.name, row.shift_actual_end)
+    frappe.cache.set_value(STATE_WARM_KEY, 1)
+
+
+def clear_checkin_state():
+    frappe.cache.delete_value(STATE_KEY)
+    frappe.cache.delete_value(STATE_WARM_KEY)
+
+
+def _state(log_type, time, name, shift_end=None):
+    return {
+        "log_type": log_type,
+        "time": str(time),
+        "name": name,
+        "shift_end": str(shift_end) if shift_end else None,
+    }
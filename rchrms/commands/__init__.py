@@ -0,0 +1,69 @@
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rchrms-generate-data")
+@click.option("--employees", type=int, default=1000, help="Total synthetic employees to have on the site")
+@click.option("--days", type=int, default=5, help="Days of check-in history per employee")
+@click.option("--company", help="Company for the synthetic employees (default: the global default)")
+@click.option("--seed", type=int, default=42)
+@pass_context
+def generate_data(context, employees, days, company=None, seed=42):
+    "Generate synthetic employees with check-ins, leave applications and WFH requests"
+    from rchrms.syntheticData import generate_synthetic_data
+
+    frappe.init(site=get_site(context))
+    frappe.connect()
+    try:
+        result = generate_synthetic_data(employees, days=days, company=company, seed=seed)
+        click.echo(f"Created {result['created']} employees, {result['employees']} synthetic in total")
+    finally:
+        frappe.destroy()
+
+
+@click.command("rchrms-clear-data")
+@pass_context
+def clear_data(context):
+    "Delete the synthetic data created by rchrms-generate-data"
+    from rchrms.syntheticData import clear_synthetic_data
+
+    frappe.init(site=get_site(context))
+    frappe.connect()
+    try:
+        clear_synthetic_data()
+        click.echo("Synthetic data deleted")
+    finally:
+        frappe.destroy()
+
+
+@click.command("rchrms-benchmark")
+@click.option("--sizes", default="1000,10000,50000", help="Comma separated employee counts")
+@click.option("--days", type=int, default=5, help="Days of check-in history per employee")
+@click.option("--company", help="Company for the synthetic employees (default: the global default)")
+@click.option("--output", default="rchrms-benchmark.json", help="Where to write the JSON report")
+@pass_context
+def benchmark(context, sizes, days, output, company=None):
+    "Time auto_checkout, autoAttendance and the leave submit hook at several headcounts"
+    from rchrms.benchmark import run_benchmarks
+
+    frappe.init(site=get_site(context))
+    frappe.connect()
+    try:
+        report = run_benchmarks(
+            sizes=[int(size) for size in sizes.split(",") if size.strip()],
+            days=days,
+            company=company,
+            output=output,
+        )
+        for result in report["results"]:
+            click.echo(
+                f"{result['employees']:>7} {result['job']:<36} "
+                f"{result['seconds']:>9.3f}s {result['queries']:>8} queries"
+            )
+        click.echo(f"Report written to {output}")
+    finally:
+        frappe.destroy()
+
+
+commands = [generate_data, clear_data, benchmark]
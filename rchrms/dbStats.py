@@ -0,0 +1,36 @@
+import frappe
+from contextlib import contextmanager
+
+WRITE_VERBS = ("insert", "update", "delete", "replace")
+
+
+@contextmanager
+def track_queries():
+    """Count the queries run through frappe.db.sql and the rows they read and wrote.
+
+    Yields a dict that is filled in while the block runs:
+    queries, rows_read and rows_written.
+    """
+    stats = frappe._dict(queries=0, rows_read=0, rows_written=0)
+    db = frappe.db
+    patched = "sql" in vars(db)
+    sql = db.sql
+
+    def counting_sql(query, *args, **kwargs):
+        result = sql(query, *args, **kwargs)
+        stats.queries += 1
+        verb = str(query).lstrip().split(None, 1)[0].lower() if query else ""
+        if verb in WRITE_VERBS:
+            stats.rows_written += max(getattr(db._cursor, "rowcount", 0) or 0, 0)
+        elif isinstance(result, (list, tuple)):
+            stats.rows_read += len(result)
+        return result
+
+    db.sql = counting_sql
+    try:
+        yield stats
+    finally:
+        if patched:
+            db.sql = sql
+        else:
+            del db.sql
@@ -0,0 +1,366 @@
+import frappe
+import io
+import os
+import math
+import base64
+import hashlib
+import tempfile
+from PIL import Image, ImageOps
+from frappe.utils import get_datetime
+from rchrms.geofence import get_geofence_index
+from rchrms.seriesNaming import reserve_names
+from rchrms.checkinState import record_punches
+from rchrms.attendanceSummary import refresh_attendance_summaries, get_summary_days
+
+
+CHECKIN_IMAGE_MAX_SIZE = 1280  # longest side, px
+CHECKIN_IMAGE_QUALITY = 75
+CHECKIN_THUMBNAIL_SIZE = 160
+CHECKIN_IMAGE_PREFIX = "checkin_"
+CHECKIN_THUMBNAIL_SUFFIX = "_small"
+
+
+def store_checkin_image(checkin_name, source):
+    """Re-encode a check-in photo and store it content-addressed; return its file_url.
+
+    `source` is raw bytes, a path or a binary file object. The photo is
+    normalised to a size- and quality-capped JPEG and named by the SHA-256 of
+    that JPEG, so identical photos share one file (and one thumbnail) on disk.
+    Each check-in still gets its own File record pointing at the shared file.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    with Image.open(source) as image:
+        # JPEGs decode straight at a reduced scale instead of at full sensor resolution
+        image.draft("RGB", (CHECKIN_IMAGE_MAX_SIZE, CHECKIN_IMAGE_MAX_SIZE))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        image.thumbnail((CHECKIN_IMAGE_MAX_SIZE, CHECKIN_IMAGE_MAX_SIZE))
+
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=CHECKIN_IMAGE_QUALITY, optimize=True)
+        content = buffer.getvalue()
+
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        filename = f"{CHECKIN_IMAGE_PREFIX}{digest}.jpg"
+        thumbnail_name = f"{CHECKIN_IMAGE_PREFIX}{digest}{CHECKIN_THUMBNAIL_SUFFIX}.jpg"
+
+        path = frappe.get_site_path("private", "files", filename)
+        if not os.path.exists(path):
+            _write_atomic(path, content)
+
+        thumbnail_path = frappe.get_site_path("private", "files", thumbnail_name)
+        if not os.path.exists(thumbnail_path):
+            image.thumbnail((CHECKIN_THUMBNAIL_SIZE, CHECKIN_THUMBNAIL_SIZE))
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=CHECKIN_IMAGE_QUALITY, optimize=True)
+            _write_atomic(thumbnail_path, buffer.getvalue())
+
+    file_doc = frappe.get_doc({
+        "doctype": "File",
+        "file_name": filename,
+        "file_url": f"/private/files/{filename}",
+        "thumbnail_url": f"/private/files/{thumbnail_name}",
+        "attached_to_doctype": "Employee Checkin",
+        "attached_to_name": checkin_name,
+        "is_private": 1,
+        "file_size": len(content),
+        "content_hash": hashlib.md5(content).hexdigest(),
+    })
+    file_doc.insert(ignore_permissions=True)
+    return file_doc.file_url
+
+
+def _write_atomic(path, content):
+    tmp_path = f"{path}.{frappe.generate_hash(length=6)}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def get_checkin_thumbnail_url(file_url):
+    """Thumbnail URL for a content-addressed check-in photo; None for older uploads."""
+    if not file_url or not file_url.startswith(f"/private/files/{CHECKIN_IMAGE_PREFIX}"):
+        return None
+    stem, ext = file_url.rsplit(".", 1)
+    if ext != "jpg" or len(stem.rsplit("_", 1)[-1]) != 32:
+        return None
+    return f"{stem}{CHECKIN_THUMBNAIL_SUFFIX}.{ext}"
+
+
+def save_checkin_image(employee, checkin_name, content):
+    """Store a check-in photo and return its file_url."""
+    if not content:
+        return None
+
+    return store_checkin_image(checkin_name, content)
+
+
+def save_checkin_image_stream(employee, checkin_name, stream, chunk_size=64 * 1024):
+    """Spool an uploaded photo to disk chunk by chunk, then store it; return its file_url.
+
+    The raw upload is never held in memory as a whole.
+    """
+    source = getattr(stream, "stream", stream)
+    file_size = 0
+    with tempfile.TemporaryFile() as spool:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            file_size += len(chunk)
+            spool.write(chunk)
+
+        if not file_size:
+            return None
+
+        spool.seek(0)
+        return store_checkin_image(checkin_name, spool)
+
+
+IMAGE_STATUS_KEY = "rchrms:checkin_image_status"
+
+
+def set_image_status(checkin_name, status):
+    frappe.cache.set_value(f"{IMAGE_STATUS_KEY}:{checkin_name}", status, expires_in_sec=24 * 60 * 60)
+
+
+def get_image_status(checkin_name):
+    return frappe.cache.get_value(f"{IMAGE_STATUS_KEY}:{checkin_name}")
+
+
+CHECKIN_SPOOL_DIR = ("private", "files", "checkin_spool")
+
+
+def spool_checkin_image(prefix, uploaded_image=None, image_base64=None):
+    """Park a photo in the site's private files until a background job stores it.
+
+    Returns the spool path relative to the site directory, so web and worker
+    hosts sharing the site's storage resolve it to the same file.
+    """
+    if not uploaded_image and not image_base64:
+        return None
+
+    os.makedirs(frappe.get_site_path(*CHECKIN_SPOOL_DIR), exist_ok=True)
+    spool_path = os.path.join(*CHECKIN_SPOOL_DIR, f"{prefix}_{frappe.generate_hash(length=6)}")
+
+    if uploaded_image:
+        uploaded_image.save(frappe.get_site_path(spool_path))
+    else:
+        content = decode_base64_image(image_base64)
+        with open(frappe.get_site_path(spool_path), "wb") as f:
+            f.write(content)
+    return spool_path
+
+
+def discard_spooled_image(spool_path):
+    path = frappe.get_site_path(spool_path)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def enqueue_checkin_image(employee, checkin_name, uploaded_image=None, image_base64=None, spool_path=None):
+    """Hand the photo to a background job; the punch itself is already committed.
+
+    Pass `spool_path` for a photo already parked with spool_checkin_image.
+    """
+    # Only the spool path travels through Redis, never the photo itself
+    spool_path = spool_path or spool_checkin_image(
+        checkin_name,
+        uploaded_image=uploaded_image,
+        image_base64=None if uploaded_image else image_base64,
+    )
+    if not spool_path:
+        return
+
+    set_image_status(checkin_name, "Queued")
+    frappe.enqueue(
+        "rchrms.employeeCheckin.attach_checkin_image",
+        queue="short",
+        employee=employee,
+        checkin_name=checkin_name,
+        spool_path=spool_path,
+    )
+
+
+def attach_checkin_image(employee, checkin_name, spool_path=None, image_base64=None):
+    """Background job: write the queued photo and link it to its Employee Checkin."""
+    try:
+        if spool_path:
+            file_url = store_checkin_image(checkin_name, frappe.get_site_path(spool_path))
+        else:
+            file_url = save_checkin_image(employee, checkin_name, decode_base64_image(image_base64))
+
+        if file_url:
+            frappe.db.set_value("Employee Checkin", checkin_name, "checkin_image", file_url)
+        frappe.db.commit()
+        set_image_status(checkin_name, "Completed")
+
+    except Exception:
+        frappe.db.rollback()
+        set_image_status(checkin_name, "Failed")
+        frappe.log_error(f"Check-in image upload failed for {checkin_name}")
+
+    finally:
+        if spool_path:
+            discard_spooled_image(spool_path)
+
+
+def get_uploaded_image():
+    """Return the multipart `checkin_image` upload of the current request, if any."""
+    files = getattr(frappe.request, "files", None)
+    if not files:
+        return None
+    return files.get("checkin_image")
+
+
+def decode_base64_image(value):
+    if not value:
+        return None
+    return base64.b64decode(value)
+
+
+def get_distance_in_meters(lat1, lon1, lat2, lon2):
+    """Haversine formula to calculate distance between two lat/lon points in meters."""
+    R = 6371000  # Earth radius in meters
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    delta_phi = math.radians(lat2 - lat1)
+    delta_lambda = math.radians(lon2 - lon1)
+
+    a = math.sin(delta_phi / 2) ** 2 + \
+        math.cos(phi1) * math.cos(phi2) * \
+        math.sin(delta_lambda / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    return R * c
+
+
+def validate_geo_location(hr_config, latitude, longitude, branch=None):
+    """Check a punch against the Geo Fence registry, or the HR Config area when none is set up.
+
+    Returns (error_message, matched_fence); error_message is None when allowed.
+    """
+    if not hr_config.geo_location_required:
+        return None, None
+
+    latitude = float(latitude)
+    longitude = float(longitude)
+
+    index = get_geofence_index()
+    if len(index):
+        fence = index.match(latitude, longitude, branch=branch)
+        if not fence:
+            return "You are outside the allowed check-in area.", None
+        return None, fence
+
+    config_lat = float(hr_config.latitude)
+    config_lon = float(hr_config.longitude)
+    allowed_area = float(hr_config.allowed_area)
+
+    distance = get_distance_in_meters(config_lat, config_lon, latitude, longitude)
+    if distance > allowed_area:
+        return (
+            f"You are outside the allowed check-in area. "
+            f"Distance: {round(distance, 2)}m, Allowed: {allowed_area}m."
+        ), None
+    return None, None
+
+
+SHIFT_FIELDS = ["shift", "shift_start", "shift_end", "shift_actual_start", "shift_actual_end"]
+
+
+LOG_TYPES = ("IN", "OUT")
+
+
+def get_employee_fetch_fields():
+    """{checkin field: employee field} for Employee Checkin's fetch_from fields on `employee`."""
+    return {
+        df.fieldname: df.fetch_from.split(".", 1)[1]
+        for df in frappe.get_meta("Employee Checkin").fields
+        if df.fetch_from and df.fetch_from.startswith("employee.")
+    }
+
+
+def get_checkin_employee_details(employees):
+    """Employee values for the fetch_from fields of Employee Checkin, one query for all employees."""
+    fetch_fields = get_employee_fetch_fields()
+    employees = list(set(employees))
+    if not employees:
+        return {}
+
+    rows = frappe.get_all(
+        "Employee",
+        filters={"name": ["in", employees]},
+        fields=["name", *set(fetch_fields.values())],
+    )
+    return {
+        row.name: frappe._dict({field: row.get(source) for field, source in fetch_fields.items()})
+        for row in rows
+    }
+
+
+def make_checkin_doc(employee, row, name=None, shift_from=None, employee_details=None):
+    """Build an unsaved Employee Checkin with its name and shift details resolved.
+
+    Pass `name` from reserve_checkin_names to skip the per-row series update,
+    `shift_from` (a checkin row) to copy its shift instead of looking it up,
+    and `employee_details` from get_checkin_employee_details when building
+    many rows, so the fetch_from fields are not read per row.
+    """
+    if row.get("log_type") not in LOG_TYPES:
+        frappe.throw(f"Log Type must be one of {', '.join(LOG_TYPES)}")
+
+    if employee_details is None:
+        employee_details = get_checkin_employee_details([employee]).get(employee)
+    if not employee_details:
+        frappe.throw(f"Employee {employee} not found")
+
+    doc = frappe.new_doc("Employee Checkin")
+    doc.employee = employee
+    # bulk inserts skip the controller, so fill the fields it would have fetched
+    doc.update(employee_details)
+    doc.log_type = row.get("log_type")
+    doc.time = get_datetime(row.get("time"))
+    doc.latitude = row.get("latitude")
+    doc.longitude = row.get("longitude")
+    doc.device_id = row.get("device_id")
+    doc.skip_auto_attendance = frappe.utils.cint(row.get("skip_auto_attendance") or 0)
+    if row.get("checkin_image"):
+        doc.checkin_image = row.get("checkin_image")
+
+    if shift_from:
+        for field in SHIFT_FIELDS:
+            doc.set(field, shift_from.get(field))
+    else:
+        # Same shift lookup the controller runs in validate, without the write.
+        doc.fetch_shift()
+
+    if name:
+        doc.name = name
+    else:
+        doc.set_new_name()
+    doc.set_user_and_timestamp()
+    return doc
+
+
+def reserve_checkin_names(count):
+    """Reserve `count` consecutive Employee Checkin names with one series update."""
+    return reserve_names("Employee Checkin", count)
+
+
+def bulk_insert_checkins(docs):
+    """Insert prepared Employee Checkin docs with a single multi-row INSERT."""
+    if not docs:
+        return
+
+    fields = list(docs[0].get_valid_dict(convert_dates_to_str=True).keys())
+    values = []
+    for doc in docs:
+        row = doc.get_valid_dict(convert_dates_to_str=True)
+        values.append(tuple(row.get(f) for f in fields))
+
+    frappe.db.bulk_insert("Employee Checkin", fields, values)
+    # bulk_insert skips doc_events, so keep the punch state and day summaries in step here
+    record_punches(docs)
+    refresh_attendance_summaries({day for d in docs for day in get_summary_days(d)})
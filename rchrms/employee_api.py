@@ -1,12 +1,33 @@
 import frappe
 from frappe import _
 from frappe.utils import nowdate
-import math
 import re
-import base64
-from frappe.utils.file_manager import save_file
 from frappe.utils import get_first_day, get_last_day
-from frappe.utils import getdate, add_days
+from frappe.utils import getdate, date_diff
+from rchrms.rchrms.doctype.hr_config.hr_config import get_hr_config
+from rchrms.rchrms.doctype.request_work_from_home.request_work_from_home import get_overlapping_wfh_request
+from rchrms.pagination import get_keyset_page, get_status_summary
+from rchrms.checkinQueue import queue_checkin, get_pending_checkins
+from rchrms.checkinState import is_duplicate_in
+from rchrms.leaveBalance import get_leave_balance
+from rchrms.workingDays import get_holiday_list, count_working_days
+from rchrms.sessionEmployee import get_session_employee, get_employee_for_user
+from rchrms.employeeCheckin import (
+    validate_geo_location,
+    decode_base64_image,
+    save_checkin_image,
+    save_checkin_image_stream,
+    get_checkin_thumbnail_url,
+    get_uploaded_image,
+    enqueue_checkin_image,
+    spool_checkin_image,
+    discard_spooled_image,
+    get_image_status,
+    make_checkin_doc,
+    get_checkin_employee_details,
+    reserve_checkin_names,
+    bulk_insert_checkins,
+)
 
 
 @frappe.whitelist(allow_guest=False)
@@ -79,7 +100,7 @@ def get_all_employees(email=None):
             frappe.local.response["data"] = None
             return
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_employee_for_user(user)
         if not employee:
             frappe.response["status"] = False
             frappe.response["message"] = "No Employee linked with this user"
@@ -185,7 +206,7 @@ def delete_employee(name):
 
 
 @frappe.whitelist(allow_guest=False)
-def get_employee_checkins(employee=None, log_type=None, month=None, year=None):
+def get_employee_checkins(employee=None, log_type=None, month=None, year=None, cursor=None, page_size=None):
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -194,7 +215,7 @@ def get_employee_checkins(employee=None, log_type=None, month=None, year=None):
             frappe.local.response["data"] = None
             return
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_employee_for_user(user)
         if not employee:
             frappe.response["status"] = False
             frappe.response["message"] = "No Employee linked with this user"
@@ -221,7 +242,7 @@ def get_employee_checkins(employee=None, log_type=None, month=None, year=None):
                 frappe.response["data"] = None
                 return
 
-        result = frappe.get_list(
+        result, next_cursor = get_keyset_page(
             "Employee Checkin",
             filters=filters,
             fields=[
@@ -233,14 +254,87 @@ def get_employee_checkins(employee=None, log_type=None, month=None, year=None):
                 "skip_auto_attendance",
                 "checkin_image"
             ],
-            limit_page_length=1000,
-            order_by="time desc"
+            order_field="time",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=1000
         )
 
+        for row in result:
+            row["checkin_thumbnail"] = get_checkin_thumbnail_url(row.get("checkin_image"))
+
+        if not cursor:
+            # Read-your-writes: punches still waiting in the ingestion queue lead the first page
+            pending = [
+                row for row in get_pending_checkins(employee)
+                if (not log_type or row.log_type == log_type)
+                and ("time" not in filters or filters["time"][1][0] <= row.time.date() <= filters["time"][1][1])
+            ]
+            result = pending + result
+
         frappe.response["status"] = True
         frappe.response["message"] = "Check-ins fetched successfully"
         frappe.response["total_in_and_out"] = len(result)
         frappe.response["data"] = result
+        frappe.response["next_cursor"] = next_cursor
+
+    except Exception as e:
+        raw_message = str(e)
+        clean_message = re.sub(r"<.*?>", "", raw_message)
+        frappe.response["status"] = False
+        frappe.response["message"] = clean_message.strip()
+        frappe.response["data"] = None
+
+
+@frappe.whitelist(allow_guest=False)
+def get_attendance_summary(month=None, year=None):
+    """Per-day first IN, last OUT and worked minutes of the session employee for one month."""
+    try:
+        if frappe.request.method != "GET":
+            frappe.local.response["http_status_code"] = 405
+            frappe.local.response["status"] = False
+            frappe.local.response["message"] = "Method Not Allowed. Use GET request."
+            frappe.local.response["data"] = None
+            return
+        employee = get_employee_for_user(frappe.session.user)
+        if not employee:
+            frappe.response["status"] = False
+            frappe.response["message"] = "No Employee linked with this user"
+            frappe.response["data"] = None
+            return
+
+        today = getdate(nowdate())
+        try:
+            month = int(month or today.month)
+            year = int(year or today.year)
+            start_date = get_first_day(f"{year}-{month}-01")
+            end_date = get_last_day(f"{year}-{month}-01")
+        except Exception:
+            frappe.response["status"] = False
+            frappe.response["message"] = "Invalid month/year format"
+            frappe.response["data"] = None
+            return
+
+        days = frappe.get_all(
+            "Daily Attendance Summary",
+            filters={"employee": employee, "attendance_date": ["between", [start_date, end_date]]},
+            fields=[
+                "attendance_date",
+                "first_in",
+                "last_out",
+                "worked_minutes",
+                "punch_count",
+                "open_session",
+                "geo_fence",
+                "punches_outside_geofence"
+            ],
+            order_by="attendance_date asc"
+        )
+
+        frappe.response["status"] = True
+        frappe.response["message"] = "Attendance summary fetched successfully"
+        frappe.response["total_worked_minutes"] = sum(day.worked_minutes for day in days)
+        frappe.response["data"] = days
 
     except Exception as e:
         raw_message = str(e)
@@ -263,7 +357,8 @@ def create_employee_checkin():
 
         data = frappe.local.form_dict
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee_details = get_session_employee(user)
+        employee = employee_details.name if employee_details else None
 
         if not employee:
             frappe.response["status"] = False
@@ -271,8 +366,13 @@ def create_employee_checkin():
             frappe.response["data"] = None
             return
 
+        # Multipart uploads are streamed to disk; base64 form field kept for older clients
+        uploaded_image = get_uploaded_image()
+
         required_fields = ["log_type", "time", "latitude", "longitude", "checkin_image"]
         for field in required_fields:
+            if field == "checkin_image" and uploaded_image:
+                continue
             if not data.get(field):
                 frappe.response["status"] = False
                 frappe.response["message"] = f"Missing required field: {field}"
@@ -280,24 +380,40 @@ def create_employee_checkin():
                 return
 
         # HR config geo-check
-        hr_config = frappe.get_single("HR Config")
-        if hr_config.geo_location_required:
-            config_lat = float(hr_config.latitude)
-            config_lon = float(hr_config.longitude)
-            allowed_area = float(hr_config.allowed_area)
-            user_lat = float(data.get("latitude"))
-            user_lon = float(data.get("longitude"))
+        hr_config = get_hr_config()
+        geo_error, fence = validate_geo_location(
+            hr_config, data.get("latitude"), data.get("longitude"), employee_details.branch
+        )
+        if geo_error:
+            frappe.response["status"] = False
+            frappe.response["message"] = geo_error
+            frappe.response["data"] = None
+            return
 
-            distance = get_distance_in_meters(config_lat, config_lon, user_lat, user_lon)
+        if is_duplicate_in(employee, data.get("log_type"), data.get("time")):
+            frappe.response["status"] = False
+            frappe.response["message"] = "You are already checked in. Please check out first."
+            frappe.response["data"] = None
+            return
 
-            if distance > allowed_area:
-                frappe.response["status"] = False
-                frappe.response["message"] = (
-                    f"You are outside the allowed check-in area. "
-                    f"Distance: {round(distance, 2)}m, Allowed: {allowed_area}m."
-                )
-                frappe.response["data"] = None
-                return
+        if hr_config.checkin_ingestion_mode == "Buffered":
+            # Validated punch is acknowledged now and written by flush_checkin_queue
+            queued = queue_checkin(employee, data, uploaded_image=uploaded_image)
+
+            frappe.response["status"] = True
+            frappe.response["message"] = "Employee Checkin queued successfully"
+            frappe.response["data"] = {
+                "name": queued["queue_id"],
+                "employee": employee,
+                "log_type": queued["log_type"],
+                "time": queued["time"],
+                "device_id": queued["device_id"],
+                "skip_auto_attendance": queued["skip_auto_attendance"],
+                "checkin_image": None,
+                "queued": 1,
+                "geofence": fence.fence if fence else None,
+            }
+            return
 
         # Create the checkin doc
         doc = frappe.new_doc("Employee Checkin")
@@ -309,23 +425,40 @@ def create_employee_checkin():
         doc.device_id = data.get("device_id")
         doc.skip_auto_attendance = frappe.utils.cint(data.get("skip_auto_attendance") or 0)
         doc.insert(ignore_permissions=True)
-        base64_image = data.get("checkin_image")
-        if base64_image:
-            decoded = base64.b64decode(base64_image)
-            filename = f"checkin_{doc.employee}_{frappe.utils.now_datetime().strftime('%Y%m%d%H%M%S')}.png"
-
-            file_doc = save_file(
-                filename,
-                decoded,
-                "Employee Checkin",
-                doc.name if doc.name else None,  # file linked after insert
-                folder=None,
-                is_private=1
+
+        if frappe.utils.cint(data.get("defer_image")):
+            # Acknowledge the punch now; the photo is written and linked by a background job
+            frappe.db.commit()
+            enqueue_checkin_image(
+                doc.employee,
+                doc.name,
+                uploaded_image=uploaded_image,
+                image_base64=data.get("checkin_image"),
             )
-            # Assign file_url to the doc
-            if file_doc:
-                doc.checkin_image = file_doc.file_url
-                doc.save(ignore_permissions=True)
+
+            frappe.response["status"] = True
+            frappe.response["message"] = "Employee Checkin created successfully"
+            frappe.response["data"] = {
+                "name": doc.name,
+                "employee": doc.employee,
+                "log_type": doc.log_type,
+                "time": doc.time,
+                "device_id": doc.device_id,
+                "skip_auto_attendance": doc.skip_auto_attendance,
+                "checkin_image": None,
+                "image_status": "Queued",
+                "geofence": fence.fence if fence else None,
+            }
+            return
+
+        if uploaded_image:
+            file_url = save_checkin_image_stream(doc.employee, doc.name, uploaded_image)
+        else:
+            file_url = save_checkin_image(doc.employee, doc.name, decode_base64_image(data.get("checkin_image")))
+        # Assign file_url to the doc
+        if file_url:
+            doc.checkin_image = file_url
+            doc.save(ignore_permissions=True)
 
         # Insert only once
         #doc.insert(ignore_permissions=True)
@@ -341,6 +474,7 @@ def create_employee_checkin():
             "device_id": doc.device_id,
             "skip_auto_attendance": doc.skip_auto_attendance,
             "checkin_image": doc.checkin_image,
+            "geofence": fence.fence if fence else None,
         }
 
     except Exception as e:
@@ -352,26 +486,181 @@ def create_employee_checkin():
         frappe.response["data"] = None
 
 
+@frappe.whitelist(allow_guest=False)
+def get_checkin_image_status(name):
+    try:
+        if frappe.request.method != "GET":
+            frappe.local.response["http_status_code"] = 405
+            frappe.local.response["status"] = False
+            frappe.local.response["message"] = "Method Not Allowed. Use GET request."
+            frappe.local.response["data"] = None
+            return
+
+        user = frappe.session.user
+        employee = get_employee_for_user(user)
+        checkin = frappe.db.get_value(
+            "Employee Checkin", name, ["name", "employee", "checkin_image"], as_dict=True
+        )
+        if not checkin or checkin.employee != employee:
+            frappe.response["status"] = False
+            frappe.response["message"] = "Employee Checkin not found"
+            frappe.response["data"] = None
+            return
+
+        image_status = get_image_status(name)
+        if checkin.checkin_image:
+            image_status = "Completed"
+
+        frappe.response["status"] = True
+        frappe.response["message"] = "Check-in image status fetched"
+        frappe.response["data"] = {
+            "name": checkin.name,
+            "checkin_image": checkin.checkin_image,
+            "image_status": image_status or "Not Found",
+        }
+
+    except Exception as e:
+        raw_message = str(e)
+        clean_message = re.sub(r"<.*?>", "", raw_message)
+        frappe.response["status"] = False
+        frappe.response["message"] = clean_message.strip()
+        frappe.response["data"] = None
+
+
+@frappe.whitelist(allow_guest=False)
+def create_employee_checkins_batch(checkins=None):
+    """Replay queued offline punches: one employee lookup, one HR Config read, one INSERT."""
+    try:
+        if frappe.request.method != "POST":
+            frappe.local.response["http_status_code"] = 405
+            frappe.local.response["status"] = False
+            frappe.local.response["message"] = "Method Not Allowed. Use POST request."
+            frappe.local.response["data"] = None
+            return
+
+        checkins = frappe.parse_json(checkins or frappe.local.form_dict.get("checkins") or "[]")
+        if not isinstance(checkins, list) or not checkins:
+            frappe.response["status"] = False
+            frappe.response["message"] = "checkins must be a non-empty list"
+            frappe.response["data"] = None
+            return
+
+        user = frappe.session.user
+        employee_details = get_session_employee(user)
+        employee = employee_details.name if employee_details else None
+        if not employee:
+            frappe.response["status"] = False
+            frappe.response["message"] = "No Employee linked with this user"
+            frappe.response["data"] = None
+            return
 
-def get_distance_in_meters(lat1, lon1, lat2, lon2):
-    """Haversine formula to calculate distance between two lat/lon points in meters."""
-    R = 6371000  # Earth radius in meters
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
+        hr_config = get_hr_config()
+        spooled = []
+
+        # Punches already stored for this employee at the replayed timestamps
+        times = []
+        for row in checkins:
+            if isinstance(row, dict) and row.get("time"):
+                try:
+                    times.append(frappe.utils.get_datetime(row.get("time")))
+                except Exception:
+                    continue  # reported against its row below
+        existing_times = set()
+        if times:
+            existing_times = {
+                frappe.utils.get_datetime(t)
+                for t in frappe.get_all(
+                    "Employee Checkin",
+                    filters={"employee": employee, "time": ["in", times]},
+                    pluck="time"
+                )
+            }
 
-    a = math.sin(delta_phi / 2) ** 2 + \
-        math.cos(phi1) * math.cos(phi2) * \
-        math.sin(delta_lambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        required_fields = ["log_type", "time", "latitude", "longitude", "checkin_image"]
+        results = []
+        accepted = []
+        for idx, row in enumerate(checkins):
+            result = {"index": idx, "status": False, "name": None, "message": None}
+            results.append(result)
 
-    return R * c
+            if not isinstance(row, dict):
+                result["message"] = "Invalid check-in payload"
+                continue
 
+            missing = next((f for f in required_fields if not row.get(f)), None)
+            if missing:
+                result["message"] = f"Missing required field: {missing}"
+                continue
+
+            try:
+                time = frappe.utils.get_datetime(row.get("time"))
+                if time in existing_times:
+                    # Already synced on an earlier attempt; the client can drop it
+                    result["status"] = True
+                    result["message"] = "Duplicate check-in skipped"
+                    continue
+
+                geo_error, fence = validate_geo_location(
+                    hr_config, row.get("latitude"), row.get("longitude"), employee_details.branch
+                )
+                if geo_error:
+                    result["message"] = geo_error
+                    continue
+
+                # Decoded and parked now, so a bad photo fails its own row before anything is committed
+                spool_path = spool_checkin_image("batch", image_base64=row.get("checkin_image"))
+                spooled.append(spool_path)
+
+            except Exception as e:
+                result["message"] = re.sub(r"<.*?>", "", str(e)).strip()
+                continue
+
+            existing_times.add(time)
+            accepted.append((result, row, fence, spool_path))
+
+        docs = []
+        checkin_employee = get_checkin_employee_details([employee]).get(employee)
+        for (result, row, fence, spool_path), name in zip(accepted, reserve_checkin_names(len(accepted))):
+            try:
+                # The photo is stored by a background job once the punches are committed
+                punch = {k: v for k, v in row.items() if k != "checkin_image"}
+                doc = make_checkin_doc(employee, punch, name=name, employee_details=checkin_employee)
+            except Exception as e:
+                result["message"] = re.sub(r"<.*?>", "", str(e)).strip()
+                discard_spooled_image(spool_path)
+                continue
+
+            docs.append((doc, spool_path))
+            result["status"] = True
+            result["name"] = doc.name
+            result["geofence"] = fence.fence if fence else None
+            result["image_status"] = "Queued"
+            result["message"] = "Employee Checkin created successfully"
+
+        bulk_insert_checkins([doc for doc, _ in docs])
+        frappe.db.commit()
+
+        spooled = []
+        for doc, spool_path in docs:
+            enqueue_checkin_image(employee, doc.name, spool_path=spool_path)
+
+        frappe.response["status"] = True
+        frappe.response["message"] = f"{len(docs)} of {len(checkins)} check-ins created"
+        frappe.response["data"] = results
+
+    except Exception as e:
+        frappe.db.rollback()
+        for spool_path in spooled:
+            discard_spooled_image(spool_path)
+        raw_message = str(e)
+        clean_message = re.sub(r"<.*?>", "", raw_message)
+        frappe.response["status"] = False
+        frappe.response["message"] = clean_message.strip()
+        frappe.response["data"] = None
 
 
 @frappe.whitelist(allow_guest=False)
-def get_employee_attendance():
+def get_employee_attendance(cursor=None, page_size=None):
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -380,7 +669,7 @@ def get_employee_attendance():
             frappe.local.response["data"] = None
             return
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_employee_for_user(user)
         if not employee:
             frappe.response["status"] = False
             frappe.response["message"] = "No Employee linked with this user"
@@ -389,7 +678,7 @@ def get_employee_attendance():
         filters = {}
         if employee:
             filters["employee"] = employee
-        attendance_records = frappe.get_list(
+        attendance_records, next_cursor = get_keyset_page(
             "Attendance",
             filters=filters,
             fields=[
@@ -402,14 +691,17 @@ def get_employee_attendance():
                 "company",
                 "workflow_state"
             ],
-            order_by="attendance_date desc",
-            limit_page_length=1000
+            order_field="attendance_date",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=1000
         )
         total = len(attendance_records)
         frappe.response["status"] = True
         frappe.response["message"] = "Attendance records fetched successfully"
         frappe.response["total_attendance"] = total
         frappe.response["data"] = attendance_records
+        frappe.response["next_cursor"] = next_cursor
 
     except Exception as e:
         raw_message = str(e)
@@ -420,9 +712,8 @@ def get_employee_attendance():
 
 #################### Leave Application API's Start ##############
 
-from collections import Counter
 @frappe.whitelist(allow_guest=False)
-def get_leave_applications():
+def get_leave_applications(cursor=None, page_size=None, summary_only=None):
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -431,7 +722,7 @@ def get_leave_applications():
             frappe.local.response["data"] = None
             return
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_employee_for_user(user)
         if not employee:
             frappe.response["status"] = False
             frappe.response["message"] = "No Employee linked with this user"
@@ -441,7 +732,15 @@ def get_leave_applications():
         if employee:
             filters["employee"] = employee
 
-        leave_apps = frappe.get_list(
+        summary = get_status_summary("Leave Application", filters)
+        if frappe.utils.cint(summary_only):
+            frappe.response["status"] = True
+            frappe.response["message"] = "Leave applications fetched successfully"
+            frappe.response["summary"] = summary
+            frappe.response["data"] = []
+            return
+
+        leave_apps, next_cursor = get_keyset_page(
             "Leave Application",
             filters=filters,
             fields=[
@@ -461,20 +760,17 @@ def get_leave_applications():
                 "description",
                 "company"
             ],
-            order_by="from_date desc",
-            limit_page_length=1000
+            order_field="from_date",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=1000
         )
 
-        total = len(leave_apps)
-        status_counts = Counter(app["status"] for app in leave_apps)
-
         frappe.response["status"]=True
         frappe.response["message"]="Leave applications fetched successfully"
-        frappe.response["summary"]={
-                                    "total_applications": total,
-                                    "status_counts": dict(status_counts)
-                                    }
+        frappe.response["summary"]=summary
         frappe.response["data"]=leave_apps
+        frappe.response["next_cursor"] = next_cursor
 
     except Exception as e:
         raw_message = str(e)
@@ -542,7 +838,7 @@ def create_leave_application():
         data = frappe.local.form_dict
 
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_employee_for_user(user)
         if not employee:
             frappe.response["status"] = False
             frappe.response["message"] = "No Employee linked with this user"
@@ -673,7 +969,7 @@ def delete_leave_application():
 ############## Request Work From Home API's Start ########
 
 @frappe.whitelist(allow_guest=False)
-def get_work_from_home_request():
+def get_work_from_home_request(cursor=None, page_size=None, summary_only=None):
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -682,7 +978,7 @@ def get_work_from_home_request():
             frappe.local.response["data"] = None
             return
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_employee_for_user(user)
         if not employee:
             frappe.response["status"] = False
             frappe.response["message"] = "No Employee linked with this user"
@@ -692,7 +988,15 @@ def get_work_from_home_request():
         if employee:
             filters["employee"] = employee
 
-        leave_apps = frappe.get_list(
+        summary = get_status_summary("Request Work From Home", filters)
+        if frappe.utils.cint(summary_only):
+            frappe.response["status"] = True
+            frappe.response["message"] = "Request Work From Home fetched successfully"
+            frappe.response["summary"] = summary
+            frappe.response["data"] = []
+            return
+
+        leave_apps, next_cursor = get_keyset_page(
             "Request Work From Home",
             filters=filters,
             fields=[
@@ -708,20 +1012,17 @@ def get_work_from_home_request():
                 "reason",
                 "work_details"
             ],
-            order_by="from_date desc",
-            limit_page_length=1000
+            order_field="from_date",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=1000
         )
 
-        total = len(leave_apps)
-        status_counts = Counter(app["status"] for app in leave_apps)
-        
         frappe.response["status"]=True
         frappe.response["message"]="Request Work From Home fetched successfully"
-        frappe.response["summary"]={
-                "total_applications": total,
-                "status_counts": dict(status_counts)
-                }
+        frappe.response["summary"]=summary
         frappe.response["data"]=leave_apps
+        frappe.response["next_cursor"] = next_cursor
 
     except Exception as e:
         raw_message = str(e)
@@ -742,7 +1043,7 @@ def create_work_from_home_requests():
         data = frappe.local.form_dict
         user = frappe.session.user
 
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_employee_for_user(user)
         if not employee:
             frappe.response["status"] = False
             frappe.response["message"] = "No Employee linked with this user"
@@ -758,20 +1059,9 @@ def create_work_from_home_requests():
                 return  # Exit early if a required field is missing
 
         # Check for duplicate WFH requests with overlapping dates
-        duplicate = frappe.db.sql("""
-            SELECT name FROM `tabRequest Work From Home`
-            WHERE employee = %s
-            AND (
-                (from_date <= %s AND to_date >= %s) OR
-                (from_date <= %s AND to_date >= %s) OR
-                (from_date >= %s AND to_date <= %s)
-            )
-        """, (
-            employee,
-            data.get("from_date"), data.get("from_date"),
-            data.get("to_date"), data.get("to_date"),
-            data.get("from_date"), data.get("to_date")
-        ), as_dict=True)
+        duplicate = get_overlapping_wfh_request(
+            employee, data.get("from_date"), data.get("to_date")
+        )
 
         if duplicate:
             frappe.response["status"] = False
@@ -827,20 +1117,9 @@ def create_work_from_home_requests_for_admin():
                 return  # Exit early if a required field is missing
 
         # Check for duplicate WFH requests with overlapping dates
-        duplicate = frappe.db.sql("""
-            SELECT name FROM `tabRequest Work From Home`
-            WHERE employee = %s
-            AND (
-                (from_date <= %s AND to_date >= %s) OR
-                (from_date <= %s AND to_date >= %s) OR
-                (from_date >= %s AND to_date <= %s)
-            )
-        """, (
-            data.get("employee"),
-            data.get("from_date"), data.get("from_date"),
-            data.get("to_date"), data.get("to_date"),
-            data.get("from_date"), data.get("to_date")
-        ), as_dict=True)
+        duplicate = get_overlapping_wfh_request(
+            data.get("employee"), data.get("from_date"), data.get("to_date")
+        )
 
         if duplicate:
             frappe.response["status"] = False
@@ -970,7 +1249,7 @@ def delete_work_from_home_request():
 ########### Attendance Request API's Start ############
 
 @frappe.whitelist(allow_guest=False)
-def get_attendance_requests():
+def get_attendance_requests(cursor=None, page_size=None):
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -979,7 +1258,7 @@ def get_attendance_requests():
             frappe.local.response["data"] = None
             return
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_employee_for_user(user)
         if not employee:
             frappe.response["status"] = False
             frappe.response["message"] = "No Employee linked with this user"
@@ -989,7 +1268,7 @@ def get_attendance_requests():
         if employee:
             filters["employee"] = employee
 
-        requests = frappe.get_list(
+        requests, next_cursor = get_keyset_page(
             "Attendance Request",
             filters=filters,
             fields=[
@@ -1011,8 +1290,10 @@ def get_attendance_requests():
                 "amended_from",
                 "workflow_state"
             ],
-            order_by="from_date desc",
-            limit_page_length=1000
+            order_field="from_date",
+            cursor=cursor,
+            page_size=page_size,
+            default_page_size=1000
         )
 
         total = len(requests)
@@ -1021,6 +1302,7 @@ def get_attendance_requests():
         frappe.response["message"]="Attendance requests fetched successfully"
         frappe.response["total_requests"]=total
         frappe.response["data"]=requests
+        frappe.response["next_cursor"] = next_cursor
 
     except Exception as e:
         raw_message = str(e)
@@ -1041,7 +1323,7 @@ def post_attendance_request():
             return
         data = frappe.local.form_dict
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_employee_for_user(user)
         if not employee:
             frappe.response["status"] = False
             frappe.response["message"] = "No Employee linked with this user"
@@ -1097,34 +1379,11 @@ def calculate_custom_days(doc, method=None):
     from_date = getdate(doc.from_date)
     to_date = getdate(doc.to_date)
 
-    # Get Holiday List from Employee or Company
-    holiday_list = None
-    if doc.employee:
-        holiday_list = frappe.db.get_value("Employee", doc.employee, "holiday_list")
-    if not holiday_list and doc.company:
-        holiday_list = frappe.db.get_value("Company", doc.company, "default_holiday_list")
-
-    holidays = set()
-    if holiday_list:
-        holidays = {
-            getdate(h.holiday_date)
-            for h in frappe.get_all(
-                "Holiday",
-                filters={"parent": holiday_list},
-                fields=["holiday_date"]
-            )
-        }
-
-    # Count days
-    total_days = 0
-    current = from_date
-    while current <= to_date:
-        if doc.include_holidays:
-            total_days += 1
-        else:
-            if current not in holidays:
-                total_days += 1
-        current = add_days(current, 1)
+    if doc.include_holidays:
+        total_days = date_diff(to_date, from_date) + 1 if to_date >= from_date else 0
+    else:
+        holiday_list = get_holiday_list(doc.employee, doc.company)
+        total_days = count_working_days(from_date, to_date, holiday_list)
 
     # Apply half day adjustment
     if doc.half_day and total_days > 0:
@@ -1212,8 +1471,6 @@ def delete_attendance_request():
 
 @frappe.whitelist(allow_guest=False)
 def get_leave_allocation():
-    from hrms.hr.doctype.leave_application.leave_application import get_leave_details
-
     try:
         if frappe.request.method != "GET":
             frappe.local.response["http_status_code"] = 405
@@ -1223,7 +1480,7 @@ def get_leave_allocation():
             return
 
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_employee_for_user(user)
         if not employee:
             frappe.response["status"] = False
             frappe.response["message"] = "No Employee linked with this user"
@@ -1232,7 +1489,7 @@ def get_leave_allocation():
     
         date = frappe.utils.today()
 
-        result = get_leave_details(employee=employee, date=date)
+        result = get_leave_balance(employee, date)
         leave_allocation = result.get("leave_allocation", {})
         lwps = result.get("lwps", [])
 
@@ -1253,13 +1510,11 @@ def get_leave_allocation():
 
 @frappe.whitelist(allow_guest=False)
 def get_leave_dashboard(employee=None, date=None):
-    from hrms.hr.doctype.leave_application.leave_application import get_leave_details
-
     try:
         # If employee is not provided, fetch from session
         if not employee:
             user = frappe.session.user
-            employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+            employee = get_employee_for_user(user)
             if not employee:
                 frappe.response["status"] = False
                 frappe.response["message"] = "No Employee linked with this user"
@@ -1271,7 +1526,7 @@ def get_leave_dashboard(employee=None, date=None):
             date = frappe.utils.today()
 
         # Get leave details
-        result = get_leave_details(employee=employee, date=date)
+        result = get_leave_balance(employee, date)
         leave_allocation = result.get("leave_allocation", {})
         lwps = result.get("lwps", [])
 
@@ -0,0 +1,168 @@
+import frappe
+import math
+import numpy as np
+
+EARTH_RADIUS = 6371000  # metres
+GEOHASH_PRECISION = 5  # ~4.9km x 4.9km cells
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+INDEX_VERSION_KEY = "rchrms:geofence_index_version"
+
+# site -> GeofenceIndex, rebuilt when the version stamp in redis changes
+_site_indexes = {}
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(geohash) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits = bits << 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+def geohash_cell_size(precision=GEOHASH_PRECISION):
+    """Return (lat_degrees, lon_degrees) covered by one geohash cell."""
+    total_bits = precision * 5
+    lon_bits = math.ceil(total_bits / 2)
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def covering_cells(latitude, longitude, radius, precision=GEOHASH_PRECISION):
+    """Geohash cells that intersect the bounding box of a circular fence."""
+    cell_lat, cell_lon = geohash_cell_size(precision)
+    d_lat = math.degrees(radius / EARTH_RADIUS)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    d_lon = min(math.degrees(radius / (EARTH_RADIUS * cos_lat)), 180.0)
+
+    lat_from = math.floor((max(latitude - d_lat, -90.0) + 90.0) / cell_lat)
+    lat_to = math.floor((min(latitude + d_lat, 90.0 - 1e-9) + 90.0) / cell_lat)
+    lon_from = math.floor((longitude - d_lon + 180.0) / cell_lon)
+    lon_to = math.floor((longitude + d_lon + 180.0) / cell_lon)
+    lon_cells = int(round(360.0 / cell_lon))
+
+    cells = set()
+    for i in range(lat_from, lat_to + 1):
+        cell_center_lat = -90.0 + (i + 0.5) * cell_lat
+        for j in range(lon_from, lon_to + 1):
+            cell_center_lon = -180.0 + ((j % lon_cells) + 0.5) * cell_lon
+            cells.add(geohash_encode(cell_center_lat, cell_center_lon, precision))
+    return cells
+
+
+def haversine_distances(latitude, longitude, latitudes, longitudes):
+    """Vectorized haversine: metres from one point to each of the given points."""
+    phi1 = np.radians(latitude)
+    phi2 = np.radians(latitudes)
+    delta_phi = phi2 - phi1
+    delta_lambda = np.radians(longitudes - longitude)
+
+    a = np.sin(delta_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(delta_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+class GeofenceIndex:
+    """Geohash grid over circular fences; candidates are confirmed with a vectorized haversine."""
+
+    def __init__(self, fences, version=None):
+        self.version = version
+        self.names = np.array([f.name for f in fences], dtype=object)
+        self.branches = np.array([f.branch or "" for f in fences], dtype=object)
+        self.sites = [f.site for f in fences]
+        self.latitudes = np.array([float(f.latitude) for f in fences], dtype=float)
+        self.longitudes = np.array([float(f.longitude) for f in fences], dtype=float)
+        self.radii = np.array([float(f.radius) for f in fences], dtype=float)
+
+        cells = {}
+        for idx, fence in enumerate(fences):
+            for cell in covering_cells(float(fence.latitude), float(fence.longitude), float(fence.radius)):
+                cells.setdefault(cell, []).append(idx)
+        self.cells = {cell: np.array(members, dtype=int) for cell, members in cells.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def match(self, latitude, longitude, branch=None):
+        """Return the nearest fence containing the point as a dict, or None."""
+        candidates = self.cells.get(geohash_encode(latitude, longitude))
+        if candidates is None:
+            return None
+
+        if branch:
+            candidates = candidates[(self.branches[candidates] == "") | (self.branches[candidates] == branch)]
+        else:
+            candidates = candidates[self.branches[candidates] == ""]
+        if not len(candidates):
+            return None
+
+        distances = haversine_distances(
+            latitude, longitude, self.latitudes[candidates], self.longitudes[candidates]
+        )
+        inside = distances <= self.radii[candidates]
+        if not inside.any():
+            return None
+
+        hits = candidates[inside]
+        best = int(np.argmin(distances[inside]))
+        idx = int(hits[best])
+        return frappe._dict(
+            fence=self.names[idx],
+            branch=self.branches[idx] or None,
+            site=self.sites[idx],
+            distance=round(float(distances[inside][best]), 2),
+            radius=float(self.radii[idx]),
+        )
+
+
+def get_geofence_index():
+    version = frappe.cache.get_value(INDEX_VERSION_KEY)
+    if not version:
+        version = frappe.generate_hash(length=10)
+        frappe.cache.set_value(INDEX_VERSION_KEY, version)
+
+    index = _site_indexes.get(frappe.local.site)
+    if index is None or index.version != version:
+        fences = frappe.get_all(
+            "Geo Fence",
+            filters={"enabled": 1},
+            fields=["name", "branch", "site", "latitude", "longitude", "radius"]
+        )
+        index = GeofenceIndex(fences, version=version)
+        _site_indexes[frappe.local.site] = index
+    return index
+
+
+def clear_geofence_index():
+    def clear():
+        frappe.cache.set_value(INDEX_VERSION_KEY, frappe.generate_hash(length=10))
+
+    clear()
+    # a request that read the old fences before this commit may rebuild under the new stamp
+    frappe.db.after_commit.add(clear)
@@ -1,6 +1,7 @@
 import frappe
 from datetime import datetime, timedelta
 from frappe.utils import strip_html
+from rchrms.sessionEmployee import get_session_employee
 
 
 @frappe.whitelist(allow_guest=False) 
@@ -13,7 +14,7 @@ def get_holiday_list():
             frappe.local.response["data"] = None
             return
         user = frappe.session.user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_session_employee(user)
 
         if not employee:
             frappe.response["status"] = False
@@ -21,7 +22,7 @@ def get_holiday_list():
             frappe.response["data"] = None
             return
 
-        holiday_list_name = frappe.db.get_value("Employee", employee, "holiday_list")
+        holiday_list_name = employee.holiday_list
         if not holiday_list_name:
             frappe.response["status"] = False
             frappe.response["message"] = "No holiday list found for this employee"
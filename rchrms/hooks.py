@@ -10,28 +10,64 @@ app_license = "mit"
 
 scheduler_events = {
     "cron": {
-        "17 12 * * *": ["rchrms.autoCheckOut.auto_checkout"],
+        "*/5 * * * *": ["rchrms.autoCheckOut.auto_checkout"],
+        "* * * * *": ["rchrms.checkinQueue.flush_checkin_queue"],
         # "30 22 * * *": ["rchrms.autoCheckOut.autoAttendance"],
     },
     "daily": [
-        "rchrms.autoCheckOut.autoAttendance"
+        "rchrms.autoCheckOut.autoAttendance",
+        "rchrms.offDayWork.aggregate_off_day_work"
     ]
 }
 
 doc_events = {
     "Leave Application": {
-        "on_submit": "rchrms.leaveAttendance.update_attendance_on_leave_submit"
+        "on_submit": "rchrms.leaveAttendance.update_attendance_on_leave_submit",
+        "on_change": "rchrms.leaveBalance.clear_leave_balance",
+        "on_trash": "rchrms.leaveBalance.clear_leave_balance"
+    },
+    "Leave Allocation": {
+        "on_change": "rchrms.leaveBalance.clear_leave_balance",
+        "on_trash": "rchrms.leaveBalance.clear_leave_balance"
+    },
+    "Leave Ledger Entry": {
+        "on_change": "rchrms.leaveBalance.clear_leave_balance",
+        "on_trash": "rchrms.leaveBalance.clear_leave_balance"
+    },
+    "Attendance Request": {
+        "before_save": "rchrms.employee_api.calculate_custom_days"
+    },
+    "Employee Checkin": {
+        "after_insert": [
+            "rchrms.checkinState.update_checkin_state",
+            "rchrms.attendanceSummary.update_attendance_summary"
+        ],
+        "on_trash": "rchrms.checkinState.update_checkin_state",
+        "after_delete": "rchrms.attendanceSummary.update_attendance_summary"
+    },
+    "Shift Type": {
+        "on_update": "rchrms.autoCheckOut.clear_checkout_wheel",
+        "on_trash": "rchrms.autoCheckOut.clear_checkout_wheel"
+    },
+    "Holiday List": {
+        "on_update": "rchrms.workingDays.clear_holiday_bitmaps",
+        "on_trash": "rchrms.workingDays.clear_holiday_bitmaps",
+        "after_rename": "rchrms.workingDays.clear_holiday_bitmaps"
+    },
+    "Employee": {
+        "on_update": "rchrms.sessionEmployee.clear_session_employee",
+        "on_trash": "rchrms.sessionEmployee.clear_session_employee",
+        "after_rename": "rchrms.sessionEmployee.clear_session_employee"
     }
 }
 
+default_log_clearing_doctypes = {
+    "Rchrms Job Log": 30
+}
+
 override_doctype_class = {
     "Leave Application": "rchrms.leaveAttendance.CustomLeaveApplication"
 }
-doc_events = {
-    "Attendance Request": {
-        "before_save": "rchrms.employee_api.calculate_custom_days"
-    }
-}
 
 
 
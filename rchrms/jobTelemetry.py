@@ -0,0 +1,76 @@
+import frappe
+import json
+import time
+import tracemalloc
+import functools
+from frappe.utils import now_datetime
+from rchrms.dbStats import track_queries
+
+
+def scheduled_job(fn=None, log_idle=True, trace_memory=False):
+    """Record each run of a scheduler job in Rchrms Job Log.
+
+    Logs start time, duration, query count, rows read and written and the
+    job's return value. Jobs that fail are logged and then re-raised. With
+    log_idle=False, runs that read and wrote nothing are not logged (for jobs
+    that fire every minute). With trace_memory=True the peak Python memory
+    allocated during the run is logged too; tracing slows allocations, so
+    keep it to infrequent jobs.
+    """
+    if fn is None:
+        return functools.partial(scheduled_job, log_idle=log_idle, trace_memory=trace_memory)
+
+    job_name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started_at = now_datetime()
+        started = time.perf_counter()
+        status, error, result, failure = "Success", None, None, None
+
+        # A job called from another traced job leaves the outer measurement alone
+        tracing = trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        with track_queries() as stats:
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                status, error, failure = "Failed", frappe.get_traceback(), e
+                frappe.db.rollback()
+
+        peak_memory = None
+        if tracing:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        if status == "Failed" or log_idle or stats.rows_written or stats.rows_read:
+            _write_log(job_name, status, started_at, time.perf_counter() - started, stats, peak_memory, result, error)
+
+        if failure:
+            raise failure
+        return result
+
+    return wrapper
+
+
+def _write_log(job_name, status, started_at, duration, stats, peak_memory, result, error):
+    try:
+        frappe.get_doc({
+            "doctype": "Rchrms Job Log",
+            "job_name": job_name,
+            "status": status,
+            "started_at": started_at,
+            "duration": duration,
+            "query_count": stats.queries,
+            "rows_read": stats.rows_read,
+            "rows_written": stats.rows_written,
+            "peak_memory": peak_memory / (1024 * 1024) if peak_memory is not None else None,
+            "result": json.dumps(result, default=str) if result is not None else None,
+            "error": error,
+        }).insert(ignore_permissions=True)
+        frappe.db.commit()
+    except Exception:
+        # telemetry must never take the job down with it
+        frappe.db.rollback()
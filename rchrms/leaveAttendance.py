@@ -1,37 +1,130 @@
 import frappe
-from frappe.utils import getdate, date_diff, add_days
+from frappe.utils import getdate, date_diff, add_days, now_datetime
+from rchrms.seriesNaming import reserve_names
+
+# Leaves longer than this are written by a background job after submit
+LEAVE_ATTENDANCE_SYNC_DAYS = 7
+
 
 def update_attendance_on_leave_submit(doc, method):
+    days = date_diff(doc.to_date, doc.from_date) + 1
+    if days > LEAVE_ATTENDANCE_SYNC_DAYS:
+        frappe.enqueue(
+            "rchrms.leaveAttendance.apply_leave_attendance",
+            queue="long",
+            enqueue_after_commit=True,
+            leave_application=doc.name,
+        )
+        return
+
+    submitted = set_leave_attendance(doc)
+    if submitted:
+        frappe.msgprint(_submitted_days_message(submitted), indicator="orange", alert=True)
+
+
+def apply_leave_attendance(leave_application):
+    """Background job for long leaves."""
+    doc = frappe.get_doc("Leave Application", leave_application)
+    if doc.docstatus != 1:
+        return
+    submitted = set_leave_attendance(doc)
+    if submitted:
+        doc.add_comment("Comment", _submitted_days_message(submitted))
+    frappe.db.commit()
+
+
+def _submitted_days_message(dates):
+    return (
+        "Attendance is already submitted for "
+        + ", ".join(frappe.utils.formatdate(d) for d in dates)
+        + " and was left unchanged. Cancel it to apply this leave."
+    )
+
+
+def set_leave_attendance(doc):
+    """Mark every day of a leave On Leave (Half Day on its half day) in bulk.
+
+    Existing Attendance for the range is read with one query and drafts are
+    updated with one UPDATE; the missing days are named with one series
+    update and added with one multi-row INSERT. Submitted Attendance is left
+    as it is; its dates are returned so the caller can report them.
+    """
     from_date = getdate(doc.from_date)
     to_date = getdate(doc.to_date)
-    half_day = doc.half_day
-    half_day_date = getdate(doc.half_day_date) if doc.half_day else None
+    half_day_date = getdate(doc.half_day_date) if doc.half_day and doc.half_day_date else None
+    now = now_datetime()
+    user = frappe.session.user
 
-    for i in range(date_diff(to_date, from_date) + 1):
-        d = add_days(from_date, i)
+    existing = {}
+    for row in frappe.get_all(
+        "Attendance",
+        filters={
+            "employee": doc.employee,
+            "attendance_date": ["between", [from_date, to_date]],
+            "docstatus": ["<", 2],
+        },
+        fields=["name", "attendance_date", "docstatus"],
+        order_by="docstatus desc, creation asc",
+    ):
+        existing.setdefault(getdate(row.attendance_date), row)
 
-        att_name = frappe.db.get_value(
-            "Attendance",
-            {"employee": doc.employee, "attendance_date": d}
-        )
-        if att_name:
-            # update existing
-            att_doc = frappe.get_doc("Attendance", att_name)
-        else:
-            # create new
-            att_doc = frappe.new_doc("Attendance")
-            att_doc.employee = doc.employee
-            att_doc.attendance_date = d
-
-        # status assignment
-        if half_day and d == half_day_date:
-            att_doc.status = "Half Day"
-        else:
-            att_doc.status = "On Leave"
+    drafts = [row.name for row in existing.values() if row.docstatus == 0]
+    submitted = sorted(date for date, row in existing.items() if row.docstatus == 1)
 
+    if drafts:
+        frappe.db.sql("""
+            UPDATE `tabAttendance`
+            SET status = IF(attendance_date = %(half_day_date)s, 'Half Day', 'On Leave'),
+                leave_application = %(leave_application)s,
+                leave_type = %(leave_type)s,
+                modified = %(now)s,
+                modified_by = %(user)s
+            WHERE name IN %(names)s
+                AND docstatus = 0
+        """, {
+            "half_day_date": half_day_date,
+            "leave_application": doc.name,
+            "leave_type": doc.leave_type,
+            "now": now,
+            "user": user,
+            "names": tuple(drafts),
+        })
+
+    missing = [
+        add_days(from_date, i) for i in range(date_diff(to_date, from_date) + 1)
+        if add_days(from_date, i) not in existing
+    ]
+    if not missing:
+        return submitted
+
+    employee = frappe.db.get_value(
+        "Employee", doc.employee, ["employee_name", "company", "department"], as_dict=True
+    )
+    docs = []
+    for d in missing:
+        att_doc = frappe.new_doc("Attendance")
+        att_doc.employee = doc.employee
+        att_doc.employee_name = employee.employee_name
+        att_doc.company = employee.company
+        att_doc.department = employee.department
+        att_doc.attendance_date = d
+        att_doc.status = "Half Day" if d == half_day_date else "On Leave"
         att_doc.leave_application = doc.name
         att_doc.leave_type = doc.leave_type
-        att_doc.save(ignore_permissions=True)
+        docs.append(att_doc)
+
+    names = reserve_names("Attendance", len(docs), docs[0].get("naming_series"))
+    for att_doc, name in zip(docs, names):
+        if name:
+            att_doc.name = name
+        else:
+            att_doc.set_new_name()
+        att_doc.set_user_and_timestamp()
+    docs = [att_doc.get_valid_dict(convert_dates_to_str=True) for att_doc in docs]
+
+    fields = list(docs[0].keys())
+    frappe.db.bulk_insert("Attendance", fields, [tuple(row.get(f) for f in fields) for row in docs])
+    return submitted
 
 
 import hrms
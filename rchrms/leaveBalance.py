@@ -0,0 +1,96 @@
+import frappe
+from frappe.utils import getdate, today
+
+LEAVE_BALANCE_KEY = "rchrms:leave_balance"
+
+
+def get_leave_balance(employee, date=None):
+    """hrms get_leave_details for an employee on a date, cached until their leave data changes.
+
+    Each employee has one redis hash keyed by date, dropped by the doc_events
+    on Leave Application, Leave Allocation and Leave Ledger Entry.
+    """
+    from hrms.hr.doctype.leave_application.leave_application import get_leave_details
+
+    date = str(getdate(date or today()))
+    key = f"{LEAVE_BALANCE_KEY}:{employee}"
+
+    details = frappe.cache.hget(key, date)
+    if details is None:
+        details = get_leave_details(employee=employee, date=date)
+        frappe.cache.hset(key, date, details)
+    return details
+
+
+def clear_leave_balance(doc, method=None):
+    """doc_events hook: forget the cached balances of the document's employee."""
+    employee = doc.get("employee") if hasattr(doc, "get") else doc
+    if not employee:
+        return
+
+    key = f"{LEAVE_BALANCE_KEY}:{employee}"
+    frappe.cache.delete_value(key)
+    # a request that read the old rows before this commit may re-cache them
+    frappe.db.after_commit.add(lambda: frappe.cache.delete_value(key))
+
+
+def get_leave_balances(employees, date=None):
+    """Leave balances for many employees with grouped reads of Leave Ledger Entry.
+
+    Mirrors the numbers of get_leave_details for the allocation period that
+    covers `date`: total allocated, taken, pending approval, expired and
+    remaining, per employee and leave type. Returns
+    {employee: {leave_type: {...}}}.
+    """
+    if not employees:
+        return {}
+
+    params = {"employees": tuple(employees), "date": getdate(date or today())}
+    balances = {}
+    for row in frappe.db.sql("""
+        SELECT l.employee, l.leave_type,
+            SUM(IF(l.transaction_type = 'Leave Allocation' AND l.leaves > 0 AND l.is_expired = 0, l.leaves, 0)) AS total_leaves,
+            -SUM(IF(l.transaction_type = 'Leave Application', l.leaves, 0)) AS leaves_taken,
+            -SUM(IF(l.is_expired = 1, l.leaves, 0)) AS expired_leaves,
+            SUM(l.leaves) AS remaining_leaves,
+            period.from_date, period.to_date
+        FROM `tabLeave Ledger Entry` l
+        JOIN (
+            SELECT employee, leave_type, MIN(from_date) AS from_date, MAX(to_date) AS to_date
+            FROM `tabLeave Ledger Entry`
+            WHERE employee IN %(employees)s
+                AND transaction_type = 'Leave Allocation'
+                AND docstatus = 1
+                AND from_date <= %(date)s
+                AND to_date >= %(date)s
+            GROUP BY employee, leave_type
+        ) period ON period.employee = l.employee AND period.leave_type = l.leave_type
+        WHERE l.docstatus = 1
+            AND l.from_date >= period.from_date
+            AND l.to_date <= period.to_date
+        GROUP BY l.employee, l.leave_type, period.from_date, period.to_date
+    """, params, as_dict=True):
+        balances.setdefault(row.employee, {})[row.leave_type] = frappe._dict(
+            total_leaves=row.total_leaves,
+            leaves_taken=row.leaves_taken,
+            leaves_pending_approval=0,
+            expired_leaves=row.expired_leaves,
+            remaining_leaves=row.remaining_leaves,
+            from_date=row.from_date,
+            to_date=row.to_date,
+        )
+
+    for row in frappe.db.sql("""
+        SELECT employee, leave_type, SUM(total_leave_days) AS pending, MIN(from_date) AS from_date
+        FROM `tabLeave Application`
+        WHERE employee IN %(employees)s
+            AND status = 'Open'
+            AND docstatus = 0
+            AND to_date >= %(date)s
+        GROUP BY employee, leave_type
+    """, params, as_dict=True):
+        balance = balances.get(row.employee, {}).get(row.leave_type)
+        if balance and getdate(row.from_date) <= getdate(balance.to_date):
+            balance.leaves_pending_approval = row.pending
+
+    return balances
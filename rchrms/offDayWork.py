@@ -0,0 +1,137 @@
+import frappe
+from frappe.utils import now_datetime
+from rchrms.jobTelemetry import scheduled_job
+
+ENTRY_DOCTYPE = "Off Day Work Entry"
+ROW_DOCTYPE = "Off Day Work Child Table"
+
+
+@scheduled_job(trace_memory=True)
+def aggregate_off_day_work():
+    """Compile submitted Attendance Requests that fall on holidays into draft Off Day Work Entries.
+
+    One query finds every request that touches a holiday or weekly off of
+    the employee's holiday list (company default as fallback) and is not on
+    an entry yet, with the number of off days it covers. Each employee's
+    latest draft entry is extended, or a new draft is created, with bulk
+    inserts; total_work_day grows by the off days added.
+    """
+    # The child table fetches total_working_hours from the request, but the
+    # field is not part of Attendance Request; read it only where a site has added it.
+    has_hours = frappe.db.has_column("Attendance Request", "total_working_hours")
+    hours = "ar.total_working_hours" if has_hours else "NULL"
+    requests = frappe.db.sql(f"""
+        SELECT ar.name, ar.employee, ar.from_date, ar.to_date, {hours} AS total_working_hours,
+            COUNT(h.name) AS off_days
+        FROM `tabAttendance Request` ar
+        JOIN `tabEmployee` e ON e.name = ar.employee
+        LEFT JOIN `tabCompany` c ON c.name = ar.company
+        JOIN `tabHoliday` h
+            ON h.parent = COALESCE(NULLIF(e.holiday_list, ''), c.default_holiday_list)
+            AND h.holiday_date BETWEEN ar.from_date AND ar.to_date
+        WHERE ar.docstatus = 1
+            AND NOT EXISTS (
+                SELECT 1 FROM `tab{ROW_DOCTYPE}` detail
+                WHERE detail.attendance_req_link = ar.name
+                    AND detail.parenttype = '{ENTRY_DOCTYPE}'
+                    AND detail.docstatus < 2
+            )
+        GROUP BY ar.name, ar.employee, ar.from_date, ar.to_date{", ar.total_working_hours" if has_hours else ""}
+        ORDER BY ar.employee, ar.from_date
+    """, as_dict=True)
+
+    if not requests:
+        return {"requests": 0, "entries_created": 0, "entries_extended": 0}
+
+    by_employee = {}
+    for request in requests:
+        by_employee.setdefault(request.employee, []).append(request)
+
+    drafts = _get_draft_entries(list(by_employee))
+    created = _create_entries([employee for employee in by_employee if employee not in drafts], drafts)
+
+    rows = []
+    for employee, employee_requests in by_employee.items():
+        entry = drafts[employee]
+        for request in employee_requests:
+            entry.idx += 1
+            rows.append((entry.name, entry.idx, request))
+
+        frappe.db.sql(f"""
+            UPDATE `tab{ENTRY_DOCTYPE}`
+            SET total_work_day = IFNULL(total_work_day, 0) + %s, modified = %s
+            WHERE name = %s
+        """, (sum(request.off_days for request in employee_requests), now_datetime(), entry.name))
+
+    _insert_rows(rows)
+    frappe.db.commit()
+
+    return {
+        "requests": len(requests),
+        "entries_created": created,
+        "entries_extended": len(by_employee) - created,
+    }
+
+
+def _get_draft_entries(employees):
+    """Latest draft entry per employee, with the last used row idx."""
+    drafts = {}
+    for entry in frappe.db.sql(f"""
+        SELECT entry.name, entry.employee_id, IFNULL(MAX(detail.idx), 0) AS idx
+        FROM `tab{ENTRY_DOCTYPE}` entry
+        LEFT JOIN `tab{ROW_DOCTYPE}` detail
+            ON detail.parent = entry.name AND detail.parenttype = '{ENTRY_DOCTYPE}'
+        WHERE entry.docstatus = 0
+            AND entry.employee_id IN %(employees)s
+        GROUP BY entry.name, entry.employee_id, entry.creation
+        ORDER BY entry.creation
+    """, {"employees": tuple(employees)}, as_dict=True):
+        drafts[entry.employee_id] = entry
+    return drafts
+
+
+def _create_entries(employees, drafts):
+    if not employees:
+        return 0
+
+    details = {
+        row.name: row
+        for row in frappe.get_all(
+            "Employee",
+            filters={"name": ["in", employees]},
+            fields=["name", "employee_name", "designation", "prefered_email", "company"],
+        )
+    }
+
+    docs = []
+    for employee in employees:
+        doc = frappe.new_doc(ENTRY_DOCTYPE)
+        doc.employee_id = employee
+        doc.employee_name = details[employee].employee_name
+        doc.designation = details[employee].designation
+        doc.email = details[employee].prefered_email
+        doc.company = details[employee].company
+        doc.total_work_day = 0
+        doc.set_new_name()
+        doc.set_user_and_timestamp()
+        docs.append(doc.get_valid_dict(convert_dates_to_str=True))
+        drafts[employee] = frappe._dict(name=doc.name, employee_id=employee, idx=0)
+
+    fields = list(docs[0].keys())
+    frappe.db.bulk_insert(ENTRY_DOCTYPE, fields, [tuple(doc.get(f) for f in fields) for doc in docs])
+    return len(docs)
+
+
+def _insert_rows(rows):
+    now = now_datetime()
+    user = frappe.session.user
+    fields = ["name", "creation", "modified", "owner", "modified_by", "docstatus",
+              "parent", "parenttype", "parentfield", "idx",
+              "attendance_req_link", "from_date", "to_date", "total_working_hours", "redeem"]
+    values = [
+        (frappe.generate_hash(length=10), now, now, user, user, 0,
+         parent, ENTRY_DOCTYPE, "work_day_details", idx,
+         request.name, request.from_date, request.to_date, request.total_working_hours, 0)
+        for parent, idx, request in rows
+    ]
+    frappe.db.bulk_insert(ROW_DOCTYPE, fields, values)
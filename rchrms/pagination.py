@@ -0,0 +1,74 @@
+import frappe
+import json
+import base64
+from frappe.utils import cint
+
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(value, name):
+    payload = json.dumps([str(value), name], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        value, name = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        frappe.throw("Invalid cursor", frappe.ValidationError)
+    return value, name
+
+
+def get_keyset_page(doctype, filters, fields, order_field, cursor=None, page_size=None, default_page_size=MAX_PAGE_SIZE):
+    """Fetch one page ordered by (order_field, name) descending.
+
+    The cursor holds the last row's (order_field, name), so each page is a range
+    scan from that point rather than an OFFSET over the rows already returned.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    page_size = min(cint(page_size) or default_page_size, MAX_PAGE_SIZE)
+
+    conditions = []
+    for field, value in (filters or {}).items():
+        if isinstance(value, (list, tuple)):
+            conditions.append([field, value[0], value[1]])
+        else:
+            conditions.append([field, "=", value])
+
+    or_filters = None
+    if cursor:
+        last_value, last_name = decode_cursor(cursor)
+        # (field, name) < (last_value, last_name)
+        conditions.append([order_field, "<=", last_value])
+        or_filters = [[order_field, "<", last_value], ["name", "<", last_name]]
+
+    rows = frappe.get_list(
+        doctype,
+        filters=conditions,
+        or_filters=or_filters,
+        fields=fields,
+        order_by=f"{order_field} desc, name desc",
+        limit_page_length=page_size + 1
+    )
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1][order_field], rows[-1]["name"])
+    return rows, next_cursor
+
+
+def get_status_summary(doctype, filters, field="status"):
+    """Row counts per `field` over everything matching the filters, with one GROUP BY."""
+    rows = frappe.get_list(
+        doctype,
+        filters=filters,
+        fields=[field, "count(name) as count"],
+        group_by=field,
+        order_by=f"{field} asc"
+    )
+    status_counts = {row[field]: row["count"] for row in rows}
+    return {
+        "total_applications": sum(status_counts.values()),
+        "status_counts": status_counts
+    }
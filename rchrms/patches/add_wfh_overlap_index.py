@@ -0,0 +1,6 @@
+from rchrms.rchrms.doctype.request_work_from_home.request_work_from_home import on_doctype_update
+
+
+def execute():
+    # Backs the (employee, from_date, to_date) overlap probe on existing sites
+    on_doctype_update()
@@ -0,0 +1,7 @@
+from frappe.utils import add_months, get_first_day, nowdate
+from rchrms.attendanceSummary import rebuild_attendance_summaries
+
+
+def execute():
+    # Month screens read from the summary; seed it for the current and previous month
+    rebuild_attendance_summaries(get_first_day(add_months(nowdate(), -1)), nowdate())
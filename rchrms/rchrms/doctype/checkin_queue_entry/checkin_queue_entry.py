@@ -0,0 +1,10 @@
+# Copyright (c) 2026, Sahin Akhtar and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+
+class CheckinQueueEntry(Document):
+    # Appended by rchrms.checkinQueue.queue_checkin, removed by flush_checkin_queue
+    pass
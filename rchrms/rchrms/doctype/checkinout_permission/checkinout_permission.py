@@ -3,25 +3,39 @@
 
 import frappe
 from frappe.model.document import Document
+from rchrms.rchrms.doctype.hr_config.hr_config import clear_hr_config_cache
 
 class CheckInOutPermission(Document):
     def before_save(self):
-        hr_config = frappe.get_single("HR Config")
-
-        # Try to find existing child row
-        existing_row = next((d for d in hr_config.checkinout_permission_config if d.doc_link == self.name), None)
+        # Touch only this permission's row instead of loading and saving the whole HR Config
+        existing_row = frappe.db.get_value(
+            "CheckInOut Permission Table",
+            {"parent": "HR Config", "parentfield": "checkinout_permission_config", "doc_link": self.name},
+            "name"
+        )
 
         if existing_row:
             # Update values if exists
-            existing_row.late_early_validation = self.late_early_validation
-            existing_row.image_required = self.image_required
+            frappe.db.set_value("CheckInOut Permission Table", existing_row, {
+                "late_early_validation": self.late_early_validation,
+                "image_required": self.image_required
+            })
         else:
             # Otherwise append new row
-            hr_config.append("checkinout_permission_config", {
+            last_idx = frappe.db.sql("""
+                SELECT COALESCE(MAX(idx), 0) FROM `tabCheckInOut Permission Table`
+                WHERE parent = 'HR Config' AND parentfield = 'checkinout_permission_config'
+            """)[0][0]
+            frappe.get_doc({
+                "doctype": "CheckInOut Permission Table",
+                "parent": "HR Config",
+                "parenttype": "HR Config",
+                "parentfield": "checkinout_permission_config",
+                "idx": last_idx + 1,
                 "doc_link": self.name,
                 "late_early_validation": self.late_early_validation,
                 "image_required": self.image_required
-            })
+            }).db_insert()
 
-        hr_config.save(ignore_permissions=True)
+        clear_hr_config_cache()
         frappe.db.commit()
@@ -0,0 +1,14 @@
+# Copyright (c) 2026, Sahin Akhtar and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class DailyAttendanceSummary(Document):
+    # Rows are maintained by rchrms.attendanceSummary from Employee Checkin
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_unique("Daily Attendance Summary", ["employee", "attendance_date"])
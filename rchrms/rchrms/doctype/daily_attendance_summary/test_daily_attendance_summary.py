@@ -0,0 +1,136 @@
+# Copyright (c) 2026, Sahin Akhtar and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import get_datetime, getdate
+
+from rchrms.attendanceSummary import assign_attendance_dates, summarize_day
+from rchrms.geofence import GeofenceIndex
+
+EMPLOYEE = "_T-Employee-00001"
+
+
+def make_punch(log_type, time, shift_start=None, latitude=0, longitude=0):
+	return frappe._dict(
+		employee=EMPLOYEE,
+		log_type=log_type,
+		time=get_datetime(time),
+		shift_start=get_datetime(shift_start) if shift_start else None,
+		latitude=latitude,
+		longitude=longitude,
+	)
+
+
+def summarize(punches, index=None):
+	"""Fold punches the way refresh_attendance_summaries does; returns {date: summary}."""
+	by_date = {}
+	for punch, date in assign_attendance_dates(punches):
+		by_date.setdefault(date, []).append(punch)
+	return {date: summarize_day(EMPLOYEE, date, rows, index=index) for date, rows in by_date.items()}
+
+
+class TestDailyAttendanceSummary(FrappeTestCase):
+	def test_single_session(self):
+		summary = summarize(
+			[make_punch("IN", "2026-03-02 09:00:00"), make_punch("OUT", "2026-03-02 17:30:00")]
+		)[getdate("2026-03-02")]
+
+		self.assertEqual(summary.worked_minutes, 510)
+		self.assertEqual(summary.first_in, get_datetime("2026-03-02 09:00:00"))
+		self.assertEqual(summary.last_out, get_datetime("2026-03-02 17:30:00"))
+		self.assertEqual(summary.punch_count, 2)
+		self.assertEqual(summary.open_session, 0)
+
+	def test_repeated_in_keeps_first(self):
+		summary = summarize(
+			[
+				make_punch("IN", "2026-03-02 09:00:00"),
+				make_punch("IN", "2026-03-02 09:20:00"),
+				make_punch("OUT", "2026-03-02 17:00:00"),
+			]
+		)[getdate("2026-03-02")]
+
+		self.assertEqual(summary.worked_minutes, 480)
+		self.assertEqual(summary.first_in, get_datetime("2026-03-02 09:00:00"))
+		self.assertEqual(summary.punch_count, 3)
+		self.assertEqual(summary.open_session, 0)
+
+	def test_out_without_in(self):
+		summary = summarize(
+			[
+				make_punch("OUT", "2026-03-02 08:00:00"),
+				make_punch("IN", "2026-03-02 09:00:00"),
+				make_punch("OUT", "2026-03-02 12:00:00"),
+			]
+		)[getdate("2026-03-02")]
+
+		self.assertEqual(summary.worked_minutes, 180)
+		self.assertEqual(summary.last_out, get_datetime("2026-03-02 12:00:00"))
+		self.assertEqual(summary.open_session, 0)
+
+	def test_open_session(self):
+		summary = summarize([make_punch("IN", "2026-03-02 09:00:00")])[getdate("2026-03-02")]
+
+		self.assertEqual(summary.worked_minutes, 0)
+		self.assertEqual(summary.open_session, 1)
+		self.assertIsNone(summary.last_out)
+
+	def test_overnight_session_counts_on_start_day(self):
+		summaries = summarize(
+			[make_punch("IN", "2026-03-02 22:00:00"), make_punch("OUT", "2026-03-03 06:00:00")]
+		)
+
+		self.assertEqual(list(summaries), [getdate("2026-03-02")])
+		summary = summaries[getdate("2026-03-02")]
+		self.assertEqual(summary.worked_minutes, 480)
+		self.assertEqual(summary.open_session, 0)
+		self.assertEqual(summary.last_out, get_datetime("2026-03-03 06:00:00"))
+
+	def test_overnight_session_follows_shift_start(self):
+		shift_start = "2026-03-02 22:00:00"
+		summaries = summarize(
+			[
+				make_punch("IN", "2026-03-02 21:50:00", shift_start=shift_start),
+				make_punch("OUT", "2026-03-03 06:10:00", shift_start=shift_start),
+				make_punch("IN", "2026-03-03 21:55:00", shift_start="2026-03-03 22:00:00"),
+			]
+		)
+
+		self.assertEqual(summaries[getdate("2026-03-02")].worked_minutes, 500)
+		self.assertEqual(summaries[getdate("2026-03-02")].punch_count, 2)
+		self.assertEqual(summaries[getdate("2026-03-03")].punch_count, 1)
+		self.assertEqual(summaries[getdate("2026-03-03")].open_session, 1)
+
+	def test_closed_session_does_not_claim_next_day_out(self):
+		summaries = summarize(
+			[
+				make_punch("IN", "2026-03-02 09:00:00"),
+				make_punch("OUT", "2026-03-02 17:00:00"),
+				make_punch("OUT", "2026-03-03 08:00:00"),
+			]
+		)
+
+		self.assertEqual(summaries[getdate("2026-03-02")].worked_minutes, 480)
+		self.assertEqual(summaries[getdate("2026-03-03")].punch_count, 1)
+		self.assertEqual(summaries[getdate("2026-03-03")].worked_minutes, 0)
+
+	def test_missing_location_is_not_outside_geofence(self):
+		index = GeofenceIndex(
+			[
+				frappe._dict(
+					name="_Test Fence", latitude=12.97, longitude=77.6, radius=300, branch=None, site=None
+				)
+			]
+		)
+		summary = summarize(
+			[
+				make_punch("IN", "2026-03-02 09:00:00", latitude=12.97, longitude=77.6),
+				make_punch("OUT", "2026-03-02 17:00:00"),
+				make_punch("IN", "2026-03-02 18:00:00", latitude=13.5, longitude=77.6),
+			],
+			index=index,
+		)[getdate("2026-03-02")]
+
+		self.assertEqual(summary.geo_fence, "_Test Fence")
+		self.assertEqual(summary.punches_outside_geofence, 1)
@@ -0,0 +1,23 @@
+# Copyright (c) 2026, Sahin Akhtar and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from rchrms.geofence import clear_geofence_index
+
+
+class GeoFence(Document):
+    def validate(self):
+        if not -90 <= (self.latitude or 0) <= 90 or not -180 <= (self.longitude or 0) <= 180:
+            frappe.throw("Latitude must be within ±90 and Longitude within ±180.")
+        if (self.radius or 0) <= 0:
+            frappe.throw("Radius must be greater than 0.")
+
+    def on_update(self):
+        clear_geofence_index()
+
+    def on_trash(self):
+        clear_geofence_index()
+
+    def after_rename(self, old, new, merge=False):
+        clear_geofence_index()
@@ -0,0 +1,80 @@
+# Copyright (c) 2026, Sahin Akhtar and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from rchrms.geofence import GeofenceIndex, geohash_cell_size, geohash_encode
+
+LATITUDE = 12.97
+# a longitude that lies exactly on a geohash cell boundary
+BOUNDARY_LONGITUDE = -180 + 5862 * geohash_cell_size()[1]
+
+
+def make_fence(name, latitude, longitude, radius, branch=None):
+	return frappe._dict(
+		name=name, latitude=latitude, longitude=longitude, radius=radius, branch=branch, site=None
+	)
+
+
+class TestGeoFence(FrappeTestCase):
+	def setUp(self):
+		self.index = GeofenceIndex(
+			[
+				make_fence("HQ", LATITUDE, BOUNDARY_LONGITUDE, 500),
+				make_fence("Annex", LATITUDE, BOUNDARY_LONGITUDE + 0.01, 300),
+				make_fence("Plant", LATITUDE + 0.005, BOUNDARY_LONGITUDE, 200, branch="Branch A"),
+			]
+		)
+
+	def test_match_across_cell_boundary(self):
+		west = (LATITUDE, BOUNDARY_LONGITUDE - 0.002)
+		east = (LATITUDE, BOUNDARY_LONGITUDE + 0.002)
+		self.assertNotEqual(geohash_encode(*west), geohash_encode(*east))
+
+		self.assertEqual(self.index.match(*west).fence, "HQ")
+		self.assertEqual(self.index.match(*east).fence, "HQ")
+
+	def test_match_near_radius(self):
+		# ~488m from HQ, ~600m from Annex
+		self.assertEqual(self.index.match(LATITUDE, BOUNDARY_LONGITUDE + 0.0045).fence, "HQ")
+		# between the two fences
+		self.assertIsNone(self.index.match(LATITUDE, BOUNDARY_LONGITUDE + 0.006))
+		self.assertEqual(self.index.match(LATITUDE, BOUNDARY_LONGITUDE + 0.009).fence, "Annex")
+
+	def test_match_returns_nearest_fence(self):
+		index = GeofenceIndex(
+			[
+				make_fence("Outer", LATITUDE, BOUNDARY_LONGITUDE, 1000),
+				make_fence("Inner", LATITUDE, BOUNDARY_LONGITUDE + 0.005, 1000),
+			]
+		)
+		self.assertEqual(index.match(LATITUDE, BOUNDARY_LONGITUDE + 0.004).fence, "Inner")
+
+	def test_match_branch_filter(self):
+		plant = (LATITUDE + 0.005, BOUNDARY_LONGITUDE)
+
+		# branch fences only match employees of that branch
+		self.assertIsNone(self.index.match(*plant))
+		self.assertIsNone(self.index.match(*plant, branch="Branch B"))
+		self.assertEqual(self.index.match(*plant, branch="Branch A").fence, "Plant")
+
+		# fences without a branch match everyone
+		self.assertEqual(self.index.match(LATITUDE, BOUNDARY_LONGITUDE, branch="Branch B").fence, "HQ")
+
+	def test_empty_index(self):
+		index = GeofenceIndex([])
+		self.assertEqual(len(index), 0)
+		self.assertIsNone(index.match(LATITUDE, BOUNDARY_LONGITUDE))
+
+	def test_validate_radius(self):
+		fence = frappe.get_doc(
+			{
+				"doctype": "Geo Fence",
+				"fence_name": "_Test Fence Zero Radius",
+				"latitude": LATITUDE,
+				"longitude": BOUNDARY_LONGITUDE,
+				"radius": 0,
+			}
+		)
+		self.assertRaises(frappe.ValidationError, fence.insert)
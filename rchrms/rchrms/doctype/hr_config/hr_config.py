@@ -1,9 +1,77 @@
 # Copyright (c) 2025, Sahin Akhtar and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
+from collections import namedtuple
+from frappe.model import no_value_fields, table_fields
 from frappe.model.document import Document
 
+HR_CONFIG_VERSION_KEY = "rchrms:hr_config_version"
+HR_CONFIG_SNAPSHOT_KEY = "rchrms:hr_config_snapshot"
+
+# site -> snapshot, reused until the version stamp in redis changes
+_site_snapshots = {}
+
 
 class HRConfig(Document):
-	pass
+	def on_update(self):
+		clear_hr_config_cache()
+		# a request that read the old row before this commit may re-cache it under the new stamp
+		frappe.db.after_commit.add(clear_hr_config_cache)
+
+
+def get_hr_config():
+	"""Return a read-only snapshot of HR Config.
+
+	Cached in-process and in redis; both are dropped when HR Config is saved.
+	Child tables are exposed as tuples of read-only rows.
+	"""
+	version = frappe.cache.get_value(HR_CONFIG_VERSION_KEY)
+	if not version:
+		version = frappe.generate_hash(length=10)
+		frappe.cache.set_value(HR_CONFIG_VERSION_KEY, version)
+
+	snapshot = _site_snapshots.get(frappe.local.site)
+	if snapshot is not None and snapshot.version == version:
+		return snapshot
+
+	data = frappe.cache.get_value(HR_CONFIG_SNAPSHOT_KEY)
+	if not data or data.get("version") != version:
+		data = _load_hr_config(version)
+		frappe.cache.set_value(HR_CONFIG_SNAPSHOT_KEY, data)
+
+	snapshot = _freeze(data)
+	_site_snapshots[frappe.local.site] = snapshot
+	return snapshot
+
+
+def clear_hr_config_cache():
+	frappe.cache.delete_value(HR_CONFIG_SNAPSHOT_KEY)
+	frappe.cache.set_value(HR_CONFIG_VERSION_KEY, frappe.generate_hash(length=10))
+
+
+def _load_hr_config(version):
+	doc = frappe.get_single("HR Config")
+	meta = frappe.get_meta("HR Config")
+
+	values = {}
+	tables = {}
+	for df in meta.fields:
+		if df.fieldtype in table_fields:
+			tables[df.fieldname] = [
+				{f.fieldname: row.get(f.fieldname) for f in frappe.get_meta(df.options).fields
+					if f.fieldtype not in no_value_fields}
+				for row in doc.get(df.fieldname)
+			]
+		elif df.fieldtype not in no_value_fields:
+			values[df.fieldname] = doc.get(df.fieldname)
+
+	return {"version": version, "values": values, "tables": tables}
+
+
+def _freeze(data):
+	fields = {"version": data["version"], **data["values"]}
+	for fieldname, rows in data["tables"].items():
+		row_type = namedtuple("HRConfigRow", rows[0].keys()) if rows else None
+		fields[fieldname] = tuple(row_type(**row) for row in rows)
+	return namedtuple("HRConfigSnapshot", fields.keys())(**fields)
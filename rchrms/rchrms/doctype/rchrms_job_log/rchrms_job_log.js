@@ -0,0 +1,8 @@
+// Copyright (c) 2026, Sahin Akhtar and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Rchrms Job Log", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -0,0 +1,10 @@
+# Copyright (c) 2026, Sahin Akhtar and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+
+class RchrmsJobLog(Document):
+    # Written by rchrms.jobTelemetry.scheduled_job around every rchrms scheduler event
+    pass
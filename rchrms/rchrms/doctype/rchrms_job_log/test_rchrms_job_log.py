@@ -0,0 +1,76 @@
+# Copyright (c) 2026, Sahin Akhtar and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from rchrms.jobTelemetry import scheduled_job
+
+
+@scheduled_job
+def _test_job_success():
+	frappe.db.sql("SELECT name FROM `tabUser` LIMIT 1")
+	return {"processed": 3}
+
+
+@scheduled_job
+def _test_job_failure():
+	raise frappe.ValidationError("Job failed on purpose")
+
+
+@scheduled_job(log_idle=False)
+def _test_job_idle():
+	return 0
+
+
+@scheduled_job(trace_memory=True)
+def _test_job_traced():
+	# ~8 MB held until the job returns
+	return len([bytes(1024) for _ in range(8 * 1024)])
+
+
+def get_logs(job):
+	return frappe.get_all(
+		"Rchrms Job Log",
+		filters={"job_name": f"{job.__module__}.{job.__qualname__}"},
+		fields=["status", "query_count", "rows_read", "peak_memory", "result", "error"],
+	)
+
+
+class TestRchrmsJobLog(FrappeTestCase):
+	def setUp(self):
+		frappe.db.delete("Rchrms Job Log", {"job_name": ["like", f"{__name__}.%"]})
+		frappe.db.commit()
+
+	def tearDown(self):
+		self.setUp()
+
+	def test_successful_run_is_logged(self):
+		self.assertEqual(_test_job_success(), {"processed": 3})
+
+		logs = get_logs(_test_job_success)
+		self.assertEqual(len(logs), 1)
+		self.assertEqual(logs[0].status, "Success")
+		self.assertEqual(logs[0].query_count, 1)
+		self.assertEqual(logs[0].rows_read, 1)
+		self.assertFalse(logs[0].peak_memory)
+		self.assertEqual(frappe.parse_json(logs[0].result), {"processed": 3})
+
+	def test_failed_run_is_logged_and_raised(self):
+		self.assertRaises(frappe.ValidationError, _test_job_failure)
+
+		logs = get_logs(_test_job_failure)
+		self.assertEqual(len(logs), 1)
+		self.assertEqual(logs[0].status, "Failed")
+		self.assertIn("Job failed on purpose", logs[0].error)
+
+	def test_idle_run_is_not_logged(self):
+		_test_job_idle()
+		self.assertEqual(get_logs(_test_job_idle), [])
+
+	def test_traced_run_logs_peak_memory(self):
+		_test_job_traced()
+
+		logs = get_logs(_test_job_traced)
+		self.assertEqual(len(logs), 1)
+		self.assertGreater(logs[0].peak_memory, 8)
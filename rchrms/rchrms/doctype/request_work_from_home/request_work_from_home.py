@@ -4,7 +4,9 @@
 import frappe
 from frappe.model.document import Document
 from datetime import datetime, date, timedelta
-from frappe.utils import getdate, add_days
+from frappe.utils import getdate
+from rchrms.rchrms.doctype.hr_config.hr_config import get_hr_config
+from rchrms.workingDays import get_holiday_list, count_working_days
 #class RequestWorkFromHome(Document):
 #	pass
 class RequestWorkFromHome(Document):
@@ -37,30 +39,9 @@ class RequestWorkFromHome(Document):
             self.days = 0
             frappe.throw("To Date must be after From Date")
 
-        holiday_list = None
-        if self.employee:
-            holiday_list = frappe.db.get_value("Employee", self.employee, "holiday_list")
-        if not holiday_list and self.company:
-            holiday_list = frappe.db.get_value("Company", self.company, "default_holiday_list")
-
-        holidays = set()
-        if holiday_list:
-            holidays = {
-                getdate(h.holiday_date)
-                for h in frappe.get_all(
-                    "Holiday",
-                    filters={"parent": holiday_list},
-                    fields=["holiday_date"]
-                )
-            }
-
         # --- count days (no include_holidays option) ---
-        total_days = 0
-        current = from_date
-        while current <= to_date:
-            if current not in holidays:   # skip holidays always
-                total_days += 1
-            current = add_days(current, 1)
+        holiday_list = get_holiday_list(self.employee, self.get("company"))
+        total_days = count_working_days(from_date, to_date, holiday_list)
 
         self.days = total_days
 
@@ -89,7 +70,7 @@ class RequestWorkFromHome(Document):
         )
 
         if from_date == today and to_date == today:
-            hr_config = frappe.get_single("HR Config")
+            hr_config = get_hr_config()
             last_allowed_time_str = hr_config.wfh_last_request_time
 
             if not last_allowed_time_str:
@@ -108,3 +89,28 @@ class RequestWorkFromHome(Document):
         else:
             pass
 
+
+WFH_OVERLAP_INDEX = "employee_from_date_to_date_index"
+
+
+def on_doctype_update():
+    frappe.db.add_index("Request Work From Home", ["employee", "from_date", "to_date"], WFH_OVERLAP_INDEX)
+
+
+def get_overlapping_wfh_request(employee, from_date, to_date):
+    """Name of a request of `employee` overlapping [from_date, to_date], or None.
+
+    Locks the Employee row first so concurrent submits for the same employee
+    queue up behind each other until the request's transaction ends; the
+    overlap check itself is a range probe on (employee, from_date, to_date).
+    """
+    frappe.db.sql("SELECT name FROM `tabEmployee` WHERE name = %s FOR UPDATE", employee)
+
+    overlap = frappe.db.sql("""
+        SELECT name FROM `tabRequest Work From Home`
+        WHERE employee = %(employee)s
+            AND from_date <= %(to_date)s
+            AND to_date >= %(from_date)s
+        LIMIT 1
+    """, {"employee": employee, "from_date": from_date, "to_date": to_date})
+    return overlap[0][0] if overlap else None
@@ -1,9 +1,56 @@
 # Copyright (c) 2025, Sahin Akhtar and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from rchrms.workingDays import count_holidays, count_working_days
+
+HOLIDAY_LIST = "_Test Rchrms Year End Holidays"
+
 
 class TestRequestWorkFromHome(FrappeTestCase):
-	pass
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		if frappe.db.exists("Holiday List", HOLIDAY_LIST):
+			frappe.delete_doc("Holiday List", HOLIDAY_LIST, force=True)
+
+		cls.holiday_list = frappe.get_doc(
+			{
+				"doctype": "Holiday List",
+				"holiday_list_name": HOLIDAY_LIST,
+				"from_date": "2026-12-01",
+				"to_date": "2027-01-31",
+				"holidays": [
+					{"holiday_date": "2026-12-25", "description": "Christmas"},
+					{"holiday_date": "2026-12-31", "description": "New Year's Eve"},
+					{"holiday_date": "2027-01-01", "description": "New Year"},
+				],
+			}
+		).insert()
+
+	def test_count_working_days_across_year_boundary(self):
+		self.assertEqual(count_holidays("2026-12-28", "2027-01-03", HOLIDAY_LIST), 2)
+		self.assertEqual(count_working_days("2026-12-28", "2027-01-03", HOLIDAY_LIST), 5)
+
+	def test_count_working_days_on_boundary_dates(self):
+		self.assertEqual(count_working_days("2026-12-31", "2026-12-31", HOLIDAY_LIST), 0)
+		self.assertEqual(count_working_days("2027-01-01", "2027-01-01", HOLIDAY_LIST), 0)
+		self.assertEqual(count_working_days("2026-12-30", "2027-01-02", HOLIDAY_LIST), 2)
+
+	def test_count_working_days_over_full_years(self):
+		# 2026-01-01 .. 2027-12-31 is 730 days
+		self.assertEqual(count_working_days("2026-01-01", "2027-12-31", HOLIDAY_LIST), 727)
+
+	def test_count_working_days_without_holiday_list(self):
+		self.assertEqual(count_working_days("2026-12-28", "2027-01-03"), 7)
+		self.assertEqual(count_working_days("2027-01-03", "2026-12-28", HOLIDAY_LIST), 0)
+
+	def test_cached_bitmap_reused(self):
+		expected = count_working_days("2026-12-01", "2027-01-31", HOLIDAY_LIST)
+
+		# drop the request memo so the packed bitmap is read back from redis
+		frappe.local.rchrms_holiday_bitmaps = {}
+		self.assertEqual(count_working_days("2026-12-01", "2027-01-31", HOLIDAY_LIST), expected)
+		self.assertEqual(expected, 62 - 3)
@@ -4,6 +4,7 @@
 import frappe
 from frappe.model.document import Document
 from frappe.utils import getdate, nowdate
+from rchrms.leaveBalance import clear_leave_balance
 
 #class WeekendTracker(Document):
 #	pass
@@ -53,6 +54,8 @@ class WeekendTracker(Document):
                 WHERE employee = %s
                   AND leave_type = %s
             """, (current_total, employee, leave_type))
+            # the raw updates skip doc_events, so drop the cached balance here
+            clear_leave_balance(employee)
 
             frappe.msgprint(f"Updated Leave Allocation (SQL) for {employee}")
         else:
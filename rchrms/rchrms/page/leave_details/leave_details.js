@@ -1,5 +1,5 @@
 frappe.pages['leave-details'].on_page_load = function (wrapper) {
-    if (wrapper.initialized) return; 
+    if (wrapper.initialized) return;
     wrapper.initialized = true;
 
     const page = frappe.ui.make_app_page({
@@ -10,101 +10,133 @@ frappe.pages['leave-details'].on_page_load = function (wrapper) {
     let content = $(`
         <div style="padding: 20px;">
             <div style="display: flex; justify-content: flex-end; align-items: center; gap: 10px; margin-bottom: 20px;">
-                <div id="employee_input" style="width: 300px;"></div>
+                <div id="department_input" style="width: 200px;"></div>
+                <div id="branch_input" style="width: 200px;"></div>
+                <div id="reports_to_input" style="width: 200px;"></div>
+                <div id="employee_input" style="width: 200px;"></div>
                 <button class="btn btn-primary" id="fetch_leave_btn">Fetch Leave Details</button>
             </div>
-            <div class="leave-details-container"></div>
+            <div class="leave-details-container" style="max-height: 70vh; overflow: auto;"></div>
+            <div style="text-align: center; margin-top: 10px;">
+                <button class="btn btn-default btn-sm" id="load_more_btn" style="display: none;">Load More</button>
+            </div>
         </div>
     `).appendTo(page.body);
 
     let leave_container = content.find('.leave-details-container');
+    let load_more_btn = content.find('#load_more_btn');
 
-    // Employee field
-    let employee_control = frappe.ui.form.make_control({
-        df: {
-            fieldtype: 'Link',
-            options: 'Employee',
-            fieldname: 'employee',
-            placeholder: 'Select Employee',
-        },
-        parent: content.find('#employee_input'),
-        render_input: true
-    });
+    function make_filter(selector, fieldname, options, placeholder) {
+        return frappe.ui.form.make_control({
+            df: {
+                fieldtype: 'Link',
+                options: options,
+                fieldname: fieldname,
+                placeholder: placeholder,
+            },
+            parent: content.find(selector),
+            render_input: true
+        });
+    }
+
+    // Filters
+    let department_control = make_filter('#department_input', 'department', 'Department', 'Department');
+    let branch_control = make_filter('#branch_input', 'branch', 'Branch', 'Branch');
+    let reports_to_control = make_filter('#reports_to_input', 'reports_to', 'Employee', 'Reports To');
+    let employee_control = make_filter('#employee_input', 'employee', 'Employee', 'Select Employee');
+
+    let rows = [];
+    let leave_types = [];
+    let next_cursor = null;
 
     // Button click
     content.find('#fetch_leave_btn').on('click', function () {
-        let employee_value = employee_control.get_value();
-
-        if (!employee_value) {
-            frappe.msgprint("Please select an Employee.");
-            return;
-        }
+        rows = [];
+        leave_types = [];
+        next_cursor = null;
+        fetchLeaveBalances();
+    });
 
-        fetchLeaveDetails(employee_value);
+    load_more_btn.on('click', function () {
+        fetchLeaveBalances(next_cursor);
     });
 
-    function fetchLeaveDetails(employee_docname) {
+    function fetchLeaveBalances(cursor) {
 
         frappe.call({
-            url: "/api/method/rchrms.employee_api.get_leave_dashboard",
+            url: "/api/method/rchrms.adminApi.get_leave_balance_grid",
             type: "GET",
-            args: { employee: employee_docname },
+            args: {
+                department: department_control.get_value(),
+                branch: branch_control.get_value(),
+                reports_to: reports_to_control.get_value(),
+                employee: employee_control.get_value(),
+                cursor: cursor
+            },
             callback: function (r) {
 
-                let res = r; 
-                leave_container.empty();
+                let res = r;
 
-                if (!res || !res.status || !res.data || !res.data.leave_allocation) {
+                if (!res || !res.status || !res.data) {
+                    leave_container.empty();
                     leave_container.append(`<p style="color:red;">No data found.</p>`);
+                    load_more_btn.hide();
                     return;
                 }
 
-                let allocation = res.data.leave_allocation;
-                let table = $(`
-                    <table class="table table-bordered" style="background:white; width:100%;">
-                        <thead style="background:#f1f1f1;">
-                            <tr>
-                                <th>Leave Type</th>
-                                <th>Total</th>
-                                <th>Taken</th>
-                                <th>Pending</th>
-                                <th>Remaining</th>
-                                <th>Expired</th>
-                            </tr>
-                        </thead>
-                        <tbody></tbody>
-                    </table>
-                `);
-
-                Object.keys(allocation).forEach(type => {
-                    let d = allocation[type];
-                    let rowColor = d.remaining_leaves > 0 ? "inherit" : "#f8d7da";
-
-                    table.find("tbody").append(`
-                        <tr style="background:${rowColor};">
-                            <td><b>${type}</b></td>
-                            <td>${d.total_leaves}</td>
-                            <td>${d.leaves_taken}</td>
-                            <td>${d.leaves_pending_approval}</td>
-                            <td>${d.remaining_leaves}</td>
-                            <td>${d.expired_leaves}</td>
-                        </tr>
-                    `);
+                rows = rows.concat(res.data);
+                (res.leave_types || []).forEach(type => {
+                    if (!leave_types.includes(type)) leave_types.push(type);
                 });
+                leave_types.sort();
+                next_cursor = res.next_cursor;
+                load_more_btn.toggle(!!next_cursor);
 
-                if (res.data.lwps && res.data.lwps.length > 0) {
-                    res.data.lwps.forEach(lwp => {
-                        table.find("tbody").append(`
-                            <tr style="background:#fff3cd;">
-                                <td><b>${lwp}</b></td>
-                                <td colspan="5" style="text-align:center;">Leave Without Pay (Not Allocated)</td>
-                            </tr>
-                        `);
-                    });
-                }
-
-                leave_container.append(table);
+                renderGrid();
             }
         });
     }
+
+    function renderGrid() {
+        leave_container.empty();
+
+        if (!rows.length) {
+            leave_container.append(`<p style="color:red;">No data found.</p>`);
+            return;
+        }
+
+        let table = $(`
+            <table class="table table-bordered" style="background:white; width:100%;">
+                <thead style="background:#f1f1f1; position: sticky; top: 0;">
+                    <tr>
+                        <th>Employee</th>
+                        <th>Department</th>
+                        ${leave_types.map(type => `<th>${frappe.utils.escape_html(type)}<br><small>Remaining / Total</small></th>`).join("")}
+                    </tr>
+                </thead>
+                <tbody></tbody>
+            </table>
+        `);
+
+        rows.forEach(row => {
+            let cells = leave_types.map(type => {
+                let d = row.leave_balances[type];
+                if (!d) return `<td style="color:#999;">-</td>`;
+
+                let rowColor = d.remaining_leaves > 0 ? "inherit" : "#f8d7da";
+                let title = `Taken: ${d.leaves_taken}, Pending: ${d.leaves_pending_approval}, Expired: ${d.expired_leaves}`;
+                return `<td style="background:${rowColor};" title="${title}">${d.remaining_leaves} / ${d.total_leaves}</td>`;
+            });
+
+            table.find("tbody").append(`
+                <tr>
+                    <td><b>${frappe.utils.escape_html(row.employee_name || row.name)}</b><br><small>${row.name}</small></td>
+                    <td>${frappe.utils.escape_html(row.department || "")}</td>
+                    ${cells.join("")}
+                </tr>
+            `);
+        });
+
+        leave_container.append(table);
+    }
 };
@@ -0,0 +1,35 @@
+import frappe
+from frappe.model.naming import parse_naming_series
+
+
+def reserve_names(doctype, count, naming_series=None):
+    """Reserve `count` consecutive names of a series-named doctype with one series update.
+
+    Handles "PREFIX.####" autonames, and "naming_series:" doctypes when the
+    document's `naming_series` is passed. Returns [None] * count for any other
+    naming rule, leaving each document to set_new_name().
+    """
+    if not count:
+        return []
+
+    autoname = frappe.get_meta(doctype).autoname or ""
+    if autoname == "naming_series:":
+        if not naming_series:
+            return [None] * count
+        # same default frappe applies in set_name_by_naming_series
+        autoname = naming_series if "#" in naming_series else f"{naming_series}.#####"
+
+    prefix, _, digits = autoname.rpartition(".")
+    if not prefix or not digits or set(digits) != {"#"}:
+        return [None] * count
+
+    series = parse_naming_series(prefix)
+    current = frappe.db.sql("SELECT `current` FROM `tabSeries` WHERE `name` = %s FOR UPDATE", series)
+    if current:
+        start = current[0][0]
+        frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name` = %s", (count, series))
+    else:
+        start = 0
+        frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (series, count))
+
+    return [f"{series}{str(start + i).zfill(len(digits))}" for i in range(1, count + 1)]
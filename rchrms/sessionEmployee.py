@@ -0,0 +1,57 @@
+import frappe
+
+SESSION_EMPLOYEE_KEY = "rchrms:session_employee"
+EMPLOYEE_FIELDS = ["name", "company", "branch", "holiday_list", "department", "reports_to"]
+
+
+def get_session_employee(user=None):
+    """Core Employee attributes for a user, cached per user until the Employee changes.
+
+    Returns a frappe._dict or None when no Employee is linked to the user.
+    """
+    user = user or frappe.session.user
+    if not user or user == "Guest":
+        return None
+
+    request_cache = getattr(frappe.local, "rchrms_session_employee", None)
+    if request_cache is None:
+        request_cache = frappe.local.rchrms_session_employee = {}
+    if user in request_cache:
+        return request_cache[user]
+
+    employee = frappe.cache.hget(SESSION_EMPLOYEE_KEY, user)
+    if employee is None:
+        employee = frappe.db.get_value("Employee", {"user_id": user}, EMPLOYEE_FIELDS, as_dict=True)
+        # Unlinked users are not cached so a later link is picked up at once
+        if employee:
+            frappe.cache.hset(SESSION_EMPLOYEE_KEY, user, dict(employee))
+
+    employee = frappe._dict(employee) if employee else None
+    request_cache[user] = employee
+    return employee
+
+
+def get_employee_for_user(user=None):
+    employee = get_session_employee(user)
+    return employee.name if employee else None
+
+
+def clear_session_employee(doc, method=None, *args):
+    """doc_events hook for Employee: drop cached entries for the old and new user_id."""
+    users = {doc.get("user_id")}
+    previous = doc.get_doc_before_save() if hasattr(doc, "get_doc_before_save") else None
+    if previous:
+        users.add(previous.get("user_id"))
+
+    def clear():
+        if method == "after_rename":
+            frappe.cache.delete_value(SESSION_EMPLOYEE_KEY)
+            return
+        for user in users:
+            if user:
+                frappe.cache.hdel(SESSION_EMPLOYEE_KEY, user)
+
+    clear()
+    # a request that read the old row before this commit may re-cache it
+    frappe.db.after_commit.add(clear)
+    frappe.local.rchrms_session_employee = {}
@@ -0,0 +1,162 @@
+import frappe
+import random
+from datetime import datetime, time, timedelta
+from frappe.utils import add_days, getdate, nowdate, now_datetime
+
+EMPLOYEE_PREFIX = "BENCH-"
+SHIFT_TYPE = "Bench Shift"
+LEAVE_TYPE = "Bench Leave"
+SHIFT_START = time(9, 0)
+SHIFT_END = time(18, 0)
+CHUNK_SIZE = 10000
+
+LEAVE_SHARE = 0.02  # employees with a leave application in the window
+WFH_SHARE = 0.03    # employees with a work from home request in the window
+
+
+def generate_synthetic_data(employees, days=5, company=None, seed=42):
+    """Top up the site to `employees` synthetic employees with realistic activity.
+
+    Every synthetic employee gets an IN and OUT on each working day of the
+    last `days` days plus an open IN for today; a share of them also get a
+    draft leave application and a work from home request. Rows go in with
+    multi-row INSERTs so 50k employees take minutes, not hours. Calling it
+    again with a larger count only adds the missing employees.
+    """
+    company = company or frappe.defaults.get_global_default("company") or frappe.db.get_value("Company", {})
+    if not company:
+        frappe.throw("Create a Company before generating synthetic data.")
+
+    rng = random.Random(seed)
+    ensure_bench_masters(company, days)
+
+    existing = frappe.db.count("Employee", {"name": ["like", f"{EMPLOYEE_PREFIX}%"]})
+    numbers = range(existing + 1, employees + 1)
+    for start in range(0, len(numbers), CHUNK_SIZE):
+        chunk = [f"{EMPLOYEE_PREFIX}{n:06d}" for n in numbers[start:start + CHUNK_SIZE]]
+        _insert_employees(chunk, company, rng)
+        _insert_checkins(chunk, days, rng)
+        _insert_leave_applications(chunk, company, days, rng)
+        _insert_wfh_requests(chunk, company, days, rng)
+        frappe.db.commit()
+
+    return {"company": company, "created": len(numbers), "employees": max(existing, employees)}
+
+
+def clear_synthetic_data():
+    """Delete everything generate_synthetic_data created."""
+    employee_filter = {"employee": ["like", f"{EMPLOYEE_PREFIX}%"]}
+    for doctype in ("Attendance", "Employee Checkin", "Leave Application",
+                    "Request Work From Home", "Daily Attendance Summary"):
+        frappe.db.delete(doctype, employee_filter)
+    frappe.db.delete("Employee", {"name": ["like", f"{EMPLOYEE_PREFIX}%"]})
+    frappe.db.commit()
+
+
+def ensure_bench_masters(company, days):
+    if not frappe.db.exists("Shift Type", SHIFT_TYPE):
+        frappe.get_doc({
+            "doctype": "Shift Type",
+            "name": SHIFT_TYPE,
+            "start_time": SHIFT_START,
+            "end_time": SHIFT_END,
+            "enable_auto_attendance": 1,
+            "process_attendance_after": add_days(nowdate(), -days),
+        }).insert(ignore_permissions=True)
+
+    if not frappe.db.exists("Leave Type", LEAVE_TYPE):
+        frappe.get_doc({
+            "doctype": "Leave Type",
+            "leave_type_name": LEAVE_TYPE,
+            "is_lwp": 1,
+        }).insert(ignore_permissions=True)
+
+
+def _insert_employees(names, company, rng):
+    now = now_datetime()
+    user = frappe.session.user
+    fields = ["name", "creation", "modified", "owner", "modified_by", "docstatus",
+              "first_name", "last_name", "employee_name", "gender", "date_of_birth",
+              "date_of_joining", "company", "status", "default_shift"]
+    values = []
+    for name in names:
+        number = name[len(EMPLOYEE_PREFIX):]
+        values.append((
+            name, now, now, user, user, 0,
+            "Bench", number, f"Bench {number}", rng.choice(["Male", "Female"]),
+            getdate("1985-01-01") + timedelta(days=rng.randrange(20 * 365)),
+            getdate("2020-01-01"), company, "Active", SHIFT_TYPE,
+        ))
+    frappe.db.bulk_insert("Employee", fields, values)
+
+
+def _insert_checkins(employees, days, rng):
+    now = now_datetime()
+    user = frappe.session.user
+    today = getdate(now)
+    fields = ["name", "creation", "modified", "owner", "modified_by", "docstatus",
+              "employee", "employee_name", "log_type", "time", "skip_auto_attendance",
+              "shift", "shift_start", "shift_end", "shift_actual_start", "shift_actual_end"]
+
+    values = []
+    for offset in range(days, -1, -1):
+        date = add_days(today, -offset)
+        if date.weekday() >= 5:
+            continue
+        shift_start = datetime.combine(date, SHIFT_START)
+        shift_end = datetime.combine(date, SHIFT_END)
+        shift = (SHIFT_TYPE, shift_start, shift_end, shift_start - timedelta(hours=1), shift_end + timedelta(hours=1))
+
+        for employee in employees:
+            employee_name = f"Bench {employee[len(EMPLOYEE_PREFIX):]}"
+            check_in = shift_start + timedelta(minutes=rng.randint(-30, 45))
+            values.append((frappe.generate_hash(length=12), now, now, user, user, 0,
+                           employee, employee_name, "IN", check_in, 0, *shift))
+            # today stays open so auto checkout has sessions to close
+            if date != today:
+                check_out = shift_end + timedelta(minutes=rng.randint(-45, 60))
+                values.append((frappe.generate_hash(length=12), now, now, user, user, 0,
+                               employee, employee_name, "OUT", check_out, 0, *shift))
+
+    frappe.db.bulk_insert("Employee Checkin", fields, values, chunk_size=CHUNK_SIZE)
+
+
+def _insert_leave_applications(employees, company, days, rng):
+    now = now_datetime()
+    user = frappe.session.user
+    today = getdate(now)
+    fields = ["name", "creation", "modified", "owner", "modified_by", "docstatus",
+              "employee", "employee_name", "company", "leave_type", "from_date", "to_date",
+              "total_leave_days", "posting_date", "status", "half_day"]
+    values = []
+    for employee in employees:
+        if rng.random() >= LEAVE_SHARE:
+            continue
+        from_date = add_days(today, -rng.randint(0, days))
+        length = rng.randint(1, 5)
+        values.append((
+            f"{EMPLOYEE_PREFIX}LA-{frappe.generate_hash(length=10)}", now, now, user, user, 0,
+            employee, f"Bench {employee[len(EMPLOYEE_PREFIX):]}", company, LEAVE_TYPE,
+            from_date, add_days(from_date, length - 1), length, today, "Open", 0,
+        ))
+    frappe.db.bulk_insert("Leave Application", fields, values, chunk_size=CHUNK_SIZE)
+
+
+def _insert_wfh_requests(employees, company, days, rng):
+    now = now_datetime()
+    user = frappe.session.user
+    today = getdate(now)
+    fields = ["name", "creation", "modified", "owner", "modified_by", "docstatus",
+              "employee", "from_date", "to_date", "days", "status"]
+    values = []
+    for employee in employees:
+        if rng.random() >= WFH_SHARE:
+            continue
+        from_date = add_days(today, -rng.randint(0, days))
+        length = rng.randint(1, 3)
+        values.append((
+            f"{employee}-{from_date}", now, now, user, user, 0,
+            employee, from_date, add_days(from_date, length - 1), length,
+            rng.choice(["Pending", "Approved", "Rejected"]),
+        ))
+    frappe.db.bulk_insert("Request Work From Home", fields, values, chunk_size=CHUNK_SIZE)
@@ -0,0 +1,79 @@
+# Copyright (c) 2026, Sahin Akhtar and Contributors
+# See license.txt
+
+import io
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from rchrms import attendanceRequestImport
+from rchrms.attendanceRequestImport import import_attendance_requests
+from rchrms.tests.utils import make_test_employee
+
+
+class TestAttendanceRequestImport(FrappeTestCase):
+	def setUp(self):
+		self.employee = make_test_employee("_Test Rchrms Request Import")
+		# the import commits per chunk, so clear what earlier runs left behind
+		frappe.db.delete("Attendance Request", {"employee": self.employee})
+
+	def get_requests(self):
+		return frappe.get_all(
+			"Attendance Request",
+			filters={"employee": self.employee},
+			fields=["name", "from_date", "to_date", "reason", "company", "docstatus"],
+			order_by="from_date",
+		)
+
+	def test_csv_import_reports_bad_rows(self):
+		e = self.employee
+		csv = "\n".join(
+			[
+				"employee,from_date,to_date,reason,shift",
+				f"{e},2026-05-04,2026-05-05,On Duty,",
+				f"{e},2026-05-11,2026-05-11,Vacation,",
+				"_Test Missing Employee,2026-05-12,2026-05-12,On Duty,",
+				f"{e},2026-05-13,2026-05-13,On Duty,_Test Missing Shift",
+				f"{e},2026-05-05,2026-05-06,Work From Home,",
+				f"{e},2026-05-20,2026-05-18,On Duty,",
+			]
+		)
+
+		# a chunk of two makes the overlap on row 6 come from an earlier chunk
+		with patch.object(attendanceRequestImport, "IMPORT_CHUNK_SIZE", 2):
+			report = import_attendance_requests(io.BytesIO(csv.encode()))
+
+		self.assertEqual((report.rows, report.created, report.failed), (6, 1, 5))
+		errors = {error["row"]: error["error"] for error in report.errors}
+		self.assertEqual(sorted(errors), [3, 4, 5, 6, 7])
+		self.assertTrue(errors[3].startswith("Reason must be one of"))
+		self.assertEqual(errors[4], "Employee _Test Missing Employee not found")
+		self.assertEqual(errors[5], "Shift Type _Test Missing Shift not found")
+		self.assertEqual(errors[6], f"Overlaps another attendance request of {e}")
+		self.assertEqual(errors[7], "To Date must be after From Date")
+
+		(request,) = self.get_requests()
+		self.assertEqual(getdate(request.from_date), getdate("2026-05-04"))
+		self.assertEqual(getdate(request.to_date), getdate("2026-05-05"))
+		self.assertEqual(request.reason, "On Duty")
+		self.assertEqual(request.company, frappe.db.get_value("Employee", e, "company"))
+		self.assertEqual(request.docstatus, 0)
+
+	def test_ndjson_import(self):
+		e = self.employee
+		ndjson = "\n".join(
+			[
+				f'{{"employee": "{e}", "from_date": "2026-06-01", "to_date": "2026-06-02", "reason": "On Duty"}}',
+				"not json",
+				"",
+				f'{{"employee": "{e}", "from_date": "2026-06-03", "to_date": "2026-06-03", "reason": "On Duty", "company": "_Test Missing Company"}}',
+			]
+		)
+		report = import_attendance_requests(io.BytesIO(ndjson.encode()), "ndjson")
+
+		self.assertEqual((report.rows, report.created, report.failed), (3, 1, 2))
+		self.assertEqual([error["row"] for error in report.errors], [2, 4])
+		self.assertEqual(report.errors[1]["error"], "Company _Test Missing Company not found")
+		self.assertEqual(len(self.get_requests()), 1)
@@ -0,0 +1,125 @@
+# Copyright (c) 2026, Sahin Akhtar and Contributors
+# See license.txt
+
+from datetime import timedelta
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import get_datetime
+
+from rchrms.autoCheckOut import (
+	WHEEL_SLOTS,
+	_floor_to_slot,
+	_minutes_of_day,
+	_slot_for_minutes,
+	_slot_of,
+	clear_checkout_wheel,
+	close_open_sessions,
+	get_checkout_wheel,
+)
+from rchrms.tests.utils import make_checkin, make_test_employee
+
+
+class TestAutoCheckout(FrappeTestCase):
+	def setUp(self):
+		self.open_employee = make_test_employee("_Test Rchrms Open Session")
+		self.closed_employee = make_test_employee("_Test Rchrms Closed Session")
+		self.old_employee = make_test_employee("_Test Rchrms Old Session")
+		self.employees = [self.open_employee, self.closed_employee, self.old_employee]
+		self.delete_checkins()
+
+	def tearDown(self):
+		self.delete_checkins()
+		frappe.db.commit()
+
+	def delete_checkins(self):
+		frappe.db.delete("Employee Checkin", {"employee": ["in", self.employees]})
+
+	def get_punches(self, employee):
+		return frappe.get_all(
+			"Employee Checkin",
+			filters={"employee": employee},
+			fields=["log_type", "time", "employee_name"],
+			order_by="time asc",
+		)
+
+	def test_close_open_sessions(self):
+		make_checkin(self.open_employee, "IN", "2026-03-02 09:00:00")
+		make_checkin(self.closed_employee, "IN", "2026-03-02 09:00:00")
+		make_checkin(self.closed_employee, "OUT", "2026-03-02 13:00:00")
+		# opened before `since`
+		make_checkin(self.old_employee, "IN", "2026-02-27 09:00:00")
+
+		result = close_open_sessions(
+			since=get_datetime("2026-03-02 00:00:00"),
+			employees=self.employees,
+			checkout_time=get_datetime("2026-03-02 20:00:00"),
+		)
+		self.assertEqual(result, {"open_sessions": 1, "checked_out": 1})
+
+		punches = self.get_punches(self.open_employee)
+		self.assertEqual([p.log_type for p in punches], ["IN", "OUT"])
+		self.assertEqual(punches[-1].time, get_datetime("2026-03-02 20:00:00"))
+		self.assertEqual(
+			punches[-1].employee_name, frappe.db.get_value("Employee", self.open_employee, "employee_name")
+		)
+		self.assertEqual(len(self.get_punches(self.closed_employee)), 2)
+		self.assertEqual(len(self.get_punches(self.old_employee)), 1)
+
+		# a second run finds nothing left open
+		result = close_open_sessions(
+			since=get_datetime("2026-03-02 00:00:00"),
+			employees=self.employees,
+			checkout_time=get_datetime("2026-03-02 20:05:00"),
+		)
+		self.assertEqual(result, {"open_sessions": 0, "checked_out": 0})
+
+	def test_close_open_sessions_without_employees(self):
+		self.assertEqual(
+			close_open_sessions(since=get_datetime("2026-03-02 00:00:00"), employees=[]),
+			{"open_sessions": 0, "checked_out": 0},
+		)
+
+
+class TestCheckoutWheel(FrappeTestCase):
+	def test_slot_for_minutes_rounds_up(self):
+		self.assertEqual(_slot_for_minutes(0), 0)
+		self.assertEqual(_slot_for_minutes(1), 1)
+		self.assertEqual(_slot_for_minutes(5), 1)
+		self.assertEqual(_slot_for_minutes(6), 2)
+		# past midnight wraps to the start of the wheel
+		self.assertEqual(_slot_for_minutes(24 * 60 - 1), 0)
+		self.assertEqual(_slot_for_minutes(24 * 60 + 7), 2)
+
+	def test_slot_of_and_floor(self):
+		moment = get_datetime("2026-03-02 17:34:59")
+		self.assertEqual(_slot_of(moment), 210)
+		self.assertEqual(_floor_to_slot(moment), get_datetime("2026-03-02 17:30:00"))
+		self.assertEqual(_slot_of(get_datetime("2026-03-02 23:59:00")), WHEEL_SLOTS - 1)
+
+	def test_minutes_of_day(self):
+		self.assertEqual(_minutes_of_day("17:30:00"), 1050)
+		self.assertEqual(_minutes_of_day(timedelta(hours=17, minutes=30)), 1050)
+		self.assertEqual(_minutes_of_day(get_datetime("2026-03-02 06:05:00").time()), 365)
+
+	def test_wheel_places_shifts_and_fallback(self):
+		shift = "_Test Rchrms Wheel Shift"
+		if not frappe.db.exists("Shift Type", shift):
+			frappe.get_doc(
+				{"doctype": "Shift Type", "name": shift, "start_time": "09:00:00", "end_time": "17:32:00"}
+			).insert()
+		clear_checkout_wheel()
+
+		hr_config = frappe._dict(
+			version=frappe.generate_hash(length=10),
+			auto_checkout_grace_minutes=30,
+			fallback_auto_checkout_time=None,
+		)
+		wheel = get_checkout_wheel(hr_config)
+
+		# 17:32 + 30 minutes is due in the 18:05 slot
+		self.assertIn(shift, wheel[str(_slot_for_minutes(18 * 60 + 2))]["shifts"])
+		self.assertEqual(_slot_for_minutes(18 * 60 + 2), 217)
+		# without a fallback time sessions with no shift still close at 12:17
+		self.assertTrue(wheel[str(_slot_for_minutes(12 * 60 + 17))]["unassigned"])
+		clear_checkout_wheel()
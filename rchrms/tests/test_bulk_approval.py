@@ -0,0 +1,73 @@
+# Copyright (c) 2026, Sahin Akhtar and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from rchrms import bulkApproval
+from rchrms.bulkApproval import bulk_set_state
+from rchrms.tests.utils import make_test_employee
+
+DOCTYPE = "Request Work From Home"
+
+
+class TestBulkApproval(FrappeTestCase):
+	def setUp(self):
+		self.employee = make_test_employee("_Test Rchrms Bulk Approval")
+		frappe.db.delete(DOCTYPE, {"employee": self.employee})
+
+	def make_request(self, date):
+		return frappe.get_doc(
+			{
+				"doctype": DOCTYPE,
+				"employee": self.employee,
+				"from_date": date,
+				"to_date": date,
+				"status": "Pending",
+			}
+		).insert().name
+
+	def test_failed_row_rolled_back_alone(self):
+		good = self.make_request("2026-04-06")
+		bad = self.make_request("2026-04-07")
+		apply_status = bulkApproval._apply_status
+
+		def submit_then_fail(doc, state, has_status):
+			# the bad row is fully submitted before it fails, so only the
+			# savepoint rollback can bring it back to draft
+			apply_status(doc, state, has_status)
+			if doc.name == bad:
+				raise frappe.ValidationError("<b>Approver</b> is on leave")
+
+		with (
+			patch.object(bulkApproval, "get_workflow_name", return_value=None),
+			patch.object(bulkApproval, "_apply_status", side_effect=submit_then_fail),
+		):
+			results = bulk_set_state(DOCTYPE, [good, bad, good, "_Test Missing Request"], "Approved")
+
+		self.assertEqual([r["name"] for r in results], [good, bad, "_Test Missing Request"])
+		self.assertEqual([r["status"] for r in results], [True, False, False])
+		self.assertEqual(results[1]["message"], "Approver is on leave")
+
+		self.assertEqual(
+			frappe.db.get_value(DOCTYPE, good, ["docstatus", "status"], as_dict=True),
+			{"docstatus": 1, "status": "Approved"},
+		)
+		self.assertEqual(
+			frappe.db.get_value(DOCTYPE, bad, ["docstatus", "status"], as_dict=True),
+			{"docstatus": 0, "status": "Pending"},
+		)
+
+	def test_rejects_without_workflow(self):
+		name = self.make_request("2026-04-08")
+		with patch.object(bulkApproval, "get_workflow_name", return_value=None):
+			(result,) = bulk_set_state(DOCTYPE, [name], "Rejected")
+
+		self.assertTrue(result["status"])
+		self.assertEqual(result["docstatus"], 1)
+		self.assertEqual(frappe.db.get_value(DOCTYPE, name, "status"), "Rejected")
+
+	def test_unsupported_doctype(self):
+		self.assertRaises(frappe.ValidationError, bulk_set_state, "ToDo", ["x"], "Approved")
@@ -0,0 +1,78 @@
+# Copyright (c) 2026, Sahin Akhtar and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from rchrms.leaveAttendance import set_leave_attendance
+from rchrms.tests.utils import get_test_company, make_test_employee
+
+
+class TestLeaveAttendance(FrappeTestCase):
+	def setUp(self):
+		self.employee = make_test_employee("_Test Rchrms Leave Attendance")
+		frappe.db.delete("Attendance", {"employee": self.employee})
+
+	def make_attendance(self, date, status="Present", submit=False):
+		doc = frappe.get_doc(
+			{
+				"doctype": "Attendance",
+				"employee": self.employee,
+				"company": get_test_company(),
+				"attendance_date": date,
+				"status": status,
+			}
+		).insert()
+		if submit:
+			doc.submit()
+		return doc.name
+
+	def get_attendance(self):
+		return {
+			getdate(row.attendance_date): row
+			for row in frappe.get_all(
+				"Attendance",
+				filters={"employee": self.employee},
+				fields=["name", "attendance_date", "status", "leave_application", "docstatus", "employee_name"],
+			)
+		}
+
+	def test_set_leave_attendance(self):
+		draft = self.make_attendance("2026-03-03")
+		submitted = self.make_attendance("2026-03-04", submit=True)
+
+		leave = frappe._dict(
+			name="_Test Leave Application",
+			employee=self.employee,
+			leave_type="_Test Leave Type",
+			from_date="2026-03-02",
+			to_date="2026-03-06",
+			half_day=1,
+			half_day_date="2026-03-06",
+		)
+		skipped = set_leave_attendance(leave)
+		self.assertEqual(skipped, [getdate("2026-03-04")])
+
+		attendance = self.get_attendance()
+		self.assertEqual(len(attendance), 5)
+
+		# the draft is updated in place, the submitted day is left alone
+		self.assertEqual(attendance[getdate("2026-03-03")].name, draft)
+		self.assertEqual(attendance[getdate("2026-03-03")].status, "On Leave")
+		self.assertEqual(attendance[getdate("2026-03-04")].name, submitted)
+		self.assertEqual(attendance[getdate("2026-03-04")].status, "Present")
+		self.assertIsNone(attendance[getdate("2026-03-04")].leave_application)
+
+		# missing days are inserted with their own series names
+		for date in ("2026-03-02", "2026-03-05"):
+			row = attendance[getdate(date)]
+			self.assertEqual(row.status, "On Leave")
+			self.assertEqual(row.leave_application, leave.name)
+			self.assertEqual(row.docstatus, 0)
+		self.assertEqual(attendance[getdate("2026-03-06")].status, "Half Day")
+		self.assertEqual(len({row.name for row in attendance.values()}), 5)
+
+		# applying the same leave again changes nothing
+		self.assertEqual(set_leave_attendance(leave), [getdate("2026-03-04")])
+		self.assertEqual(len(self.get_attendance()), 5)
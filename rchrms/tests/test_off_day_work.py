@@ -0,0 +1,103 @@
+# Copyright (c) 2026, Sahin Akhtar and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from rchrms.offDayWork import ENTRY_DOCTYPE, ROW_DOCTYPE, aggregate_off_day_work
+from rchrms.tests.utils import get_test_company, make_test_employee
+
+HOLIDAY_LIST = "_Test Rchrms Off Day Holidays"
+
+
+class TestOffDayWork(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		if frappe.db.exists("Holiday List", HOLIDAY_LIST):
+			frappe.delete_doc("Holiday List", HOLIDAY_LIST, force=True)
+
+		frappe.get_doc(
+			{
+				"doctype": "Holiday List",
+				"holiday_list_name": HOLIDAY_LIST,
+				"from_date": "2026-08-01",
+				"to_date": "2026-08-31",
+				"holidays": [
+					{"holiday_date": "2026-08-15", "description": "Independence Day"},
+					{"holiday_date": "2026-08-29", "description": "Onam"},
+				],
+			}
+		).insert()
+		cls.employee = make_test_employee("_Test Rchrms Off Day", holiday_list=HOLIDAY_LIST)
+
+	def setUp(self):
+		# the aggregate commits, so clear what earlier runs left behind
+		entries = frappe.get_all(ENTRY_DOCTYPE, filters={"employee_id": self.employee}, pluck="name")
+		if entries:
+			frappe.db.delete(ROW_DOCTYPE, {"parent": ["in", entries], "parenttype": ENTRY_DOCTYPE})
+			frappe.db.delete(ENTRY_DOCTYPE, {"name": ["in", entries]})
+		frappe.db.delete("Attendance Request", {"employee": self.employee})
+
+	def make_request(self, from_date, to_date):
+		doc = frappe.get_doc(
+			{
+				"doctype": "Attendance Request",
+				"employee": self.employee,
+				"company": get_test_company(),
+				"from_date": from_date,
+				"to_date": to_date,
+				"reason": "On Duty",
+			}
+		).insert()
+		# only the submitted state matters here, not the Attendance hrms marks on submit
+		doc.db_set("docstatus", 1)
+		return doc.name
+
+	def get_entries(self):
+		return frappe.get_all(
+			ENTRY_DOCTYPE,
+			filters={"employee_id": self.employee},
+			fields=["name", "total_work_day", "docstatus"],
+		)
+
+	def test_aggregate_off_day_work(self):
+		request = self.make_request("2026-08-14", "2026-08-16")
+		self.make_request("2026-08-18", "2026-08-19")
+
+		aggregate_off_day_work()
+
+		(entry,) = self.get_entries()
+		self.assertEqual(entry.docstatus, 0)
+		self.assertEqual(entry.total_work_day, 1)
+		rows = frappe.get_all(
+			ROW_DOCTYPE,
+			filters={"parent": entry.name, "parenttype": ENTRY_DOCTYPE},
+			fields=["attendance_req_link", "idx"],
+		)
+		self.assertEqual([(row.attendance_req_link, row.idx) for row in rows], [(request, 1)])
+
+		# requests already on an entry are not added twice
+		aggregate_off_day_work()
+		self.assertEqual(self.get_entries(), [entry])
+		self.assertEqual(frappe.db.count(ROW_DOCTYPE, {"parent": entry.name}), 1)
+
+	def test_extends_draft_entry(self):
+		first = self.make_request("2026-08-15", "2026-08-15")
+		aggregate_off_day_work()
+		(entry,) = self.get_entries()
+
+		# a request submitted later lands on the same draft entry
+		second = self.make_request("2026-08-28", "2026-08-29")
+		aggregate_off_day_work()
+
+		(extended,) = self.get_entries()
+		self.assertEqual(extended.name, entry.name)
+		self.assertEqual(extended.total_work_day, 2)
+		rows = frappe.get_all(
+			ROW_DOCTYPE,
+			filters={"parent": entry.name, "parenttype": ENTRY_DOCTYPE},
+			fields=["attendance_req_link", "idx"],
+			order_by="idx",
+		)
+		self.assertEqual([(row.attendance_req_link, row.idx) for row in rows], [(first, 1), (second, 2)])
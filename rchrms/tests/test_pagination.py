@@ -0,0 +1,78 @@
+# Copyright (c) 2026, Sahin Akhtar and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from rchrms.pagination import decode_cursor, encode_cursor, get_keyset_page
+
+JOB_NAME = "_test_rchrms_pagination"
+
+
+class TestKeysetPagination(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		# ties on started_at force the name tie-breaker to decide the order
+		for started_at in [
+			"2026-01-01 09:00:00",
+			"2026-01-01 09:00:00",
+			"2026-01-01 09:00:00",
+			"2026-01-01 10:00:00",
+			"2026-01-01 10:00:00",
+			"2026-01-01 11:00:00",
+			"2026-01-01 12:00:00",
+		]:
+			frappe.get_doc(
+				{
+					"doctype": "Rchrms Job Log",
+					"job_name": JOB_NAME,
+					"status": "Success",
+					"started_at": started_at,
+				}
+			).insert(ignore_permissions=True)
+
+	def get_all_pages(self, page_size):
+		rows, cursor, pages = [], None, 0
+		while True:
+			page, cursor = get_keyset_page(
+				"Rchrms Job Log",
+				filters={"job_name": JOB_NAME},
+				fields=["name", "started_at"],
+				order_field="started_at",
+				cursor=cursor,
+				page_size=page_size,
+			)
+			rows.extend(page)
+			pages += 1
+			if not cursor:
+				return rows, pages
+
+	def test_pages_cover_every_row_once_in_order(self):
+		expected = frappe.get_all(
+			"Rchrms Job Log",
+			filters={"job_name": JOB_NAME},
+			fields=["name", "started_at"],
+			order_by="started_at desc, name desc",
+		)
+
+		for page_size in (1, 2, 3, 7):
+			rows, pages = self.get_all_pages(page_size)
+			self.assertEqual([row.name for row in rows], [row.name for row in expected])
+			self.assertEqual(pages, -(-len(expected) // page_size))
+
+	def test_last_page_has_no_cursor(self):
+		rows, cursor = get_keyset_page(
+			"Rchrms Job Log",
+			filters={"job_name": JOB_NAME},
+			fields=["name", "started_at"],
+			order_field="started_at",
+			page_size=10,
+		)
+		self.assertEqual(len(rows), 7)
+		self.assertIsNone(cursor)
+
+	def test_cursor_round_trip(self):
+		cursor = encode_cursor("2026-01-01 09:00:00", "abc123")
+		self.assertEqual(decode_cursor(cursor), ("2026-01-01 09:00:00", "abc123"))
+		self.assertRaises(frappe.ValidationError, decode_cursor, "not-a-cursor")
@@ -0,0 +1,55 @@
+# Copyright (c) 2026, Sahin Akhtar and Contributors
+# See license.txt
+
+import frappe
+
+TEST_COMPANY = "_Test Rchrms Company"
+
+
+def get_test_company():
+	if not frappe.db.exists("Company", TEST_COMPANY):
+		frappe.get_doc(
+			{
+				"doctype": "Company",
+				"company_name": TEST_COMPANY,
+				"abbr": "_TRC",
+				"default_currency": "INR",
+				"country": "India",
+			}
+		).insert()
+	return TEST_COMPANY
+
+
+def make_test_employee(first_name, **kwargs):
+	"""Return the name of an active test Employee, creating it on first use."""
+	name = frappe.db.get_value("Employee", {"first_name": first_name})
+	if name:
+		return name
+
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "Employee",
+				"first_name": first_name,
+				"gender": "Male",
+				"date_of_birth": "1990-01-01",
+				"date_of_joining": "2020-01-01",
+				"company": get_test_company(),
+				"status": "Active",
+				**kwargs,
+			}
+		)
+		.insert()
+		.name
+	)
+
+
+def make_checkin(employee, log_type, time):
+	return frappe.get_doc(
+		{
+			"doctype": "Employee Checkin",
+			"employee": employee,
+			"log_type": log_type,
+			"time": time,
+		}
+	).insert()
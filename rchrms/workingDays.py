@@ -0,0 +1,86 @@
+import frappe
+import numpy as np
+from datetime import date
+from frappe.utils import getdate
+
+HOLIDAY_BITMAP_KEY = "rchrms:holiday_bitmap"
+
+
+def get_holiday_list(employee=None, company=None):
+    """The employee's holiday list, falling back to the company default."""
+    holiday_list = None
+    if employee:
+        holiday_list = frappe.get_cached_value("Employee", employee, "holiday_list")
+    if not holiday_list and company:
+        holiday_list = frappe.get_cached_value("Company", company, "default_holiday_list")
+    return holiday_list
+
+
+def get_holiday_bitmap(holiday_list, year):
+    """Boolean array with one entry per day of `year`, True on the list's holidays.
+
+    Stored bit-packed in a redis hash per holiday list and reused for the
+    rest of the request; the hash is dropped when the Holiday List changes.
+    """
+    memo = getattr(frappe.local, "rchrms_holiday_bitmaps", None)
+    if memo is None:
+        memo = frappe.local.rchrms_holiday_bitmaps = {}
+    if (holiday_list, year) in memo:
+        return memo[(holiday_list, year)]
+
+    start = date(year, 1, 1)
+    days = (date(year + 1, 1, 1) - start).days
+    key = f"{HOLIDAY_BITMAP_KEY}:{holiday_list}"
+
+    packed = frappe.cache.hget(key, year)
+    if packed is None:
+        bitmap = np.zeros(days, dtype=bool)
+        offsets = [
+            (getdate(holiday_date) - start).days
+            for holiday_date in frappe.get_all(
+                "Holiday",
+                filters={"parent": holiday_list, "holiday_date": ["between", [start, date(year, 12, 31)]]},
+                pluck="holiday_date"
+            )
+        ]
+        bitmap[offsets] = True
+        frappe.cache.hset(key, year, np.packbits(bitmap).tobytes())
+    else:
+        bitmap = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=days).astype(bool)
+
+    memo[(holiday_list, year)] = bitmap
+    return bitmap
+
+
+def count_holidays(from_date, to_date, holiday_list):
+    """Holidays of `holiday_list` between two dates, both inclusive."""
+    from_date, to_date = getdate(from_date), getdate(to_date)
+    if not holiday_list or to_date < from_date:
+        return 0
+
+    total = 0
+    for year in range(from_date.year, to_date.year + 1):
+        start = from_date if year == from_date.year else date(year, 1, 1)
+        end = to_date if year == to_date.year else date(year, 12, 31)
+        bitmap = get_holiday_bitmap(holiday_list, year)
+        offset = date(year, 1, 1)
+        total += int(np.count_nonzero(bitmap[(start - offset).days:(end - offset).days + 1]))
+    return total
+
+
+def count_working_days(from_date, to_date, holiday_list=None):
+    """Days between two dates, both inclusive, that are not holidays of `holiday_list`."""
+    from_date, to_date = getdate(from_date), getdate(to_date)
+    if to_date < from_date:
+        return 0
+    return (to_date - from_date).days + 1 - count_holidays(from_date, to_date, holiday_list)
+
+
+def clear_holiday_bitmaps(doc, method=None, *args):
+    """doc_events hook for Holiday List."""
+    names = {doc.name}
+    if method == "after_rename" and args:
+        names.add(args[0])
+    for name in names:
+        frappe.cache.delete_value(f"{HOLIDAY_BITMAP_KEY}:{name}")
+    frappe.local.rchrms_holiday_bitmaps = {}